@@ -0,0 +1,4 @@
+from compactor.compactor import main
+
+if __name__ == "__main__":
+    main()
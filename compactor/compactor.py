@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import heapq
+import shutil
+import hashlib
+import argparse
+import tempfile
+from multiprocessing import Pool
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from crawler.dates import TR_TZ, parse_datetime
+from crawler.dedupe import find_url
+
+# ---------------------------------------------------------------------
+#  AYARLAR
+# ---------------------------------------------------------------------
+
+DEFAULT_DATA_DIRS = ["output"]
+DEFAULT_MEMORY_MB = 256
+# Birleştirmede aynı anda açık tutulacak en fazla ara dosya
+MAX_MERGE_FANIN = 64
+# Bölümlemede aynı anda açık tutulacak en fazla çıktı dosyası
+MAX_OPEN_PARTITIONS = 128
+
+# Üst seviye "date_time" alanı (bkz. crawler.dedupe.URL_RE)
+DATE_RE = re.compile(rb'"date_time":\s*"((?:[^"\\]|\\.)*)"')
+
+# Ara dosya satırı: <anahtar>\t<sıra>\t<orijinal JSON satırı>
+SEQ_WIDTH = 12
+
+
+# ---------------------------------------------------------------------
+#  ANAHTAR / TARİH
+# ---------------------------------------------------------------------
+
+
+def record_key(line: bytes) -> Optional[bytes]:
+    """Sıralama anahtarı: URL; URL'siz kayıtlar için satırın özeti (birebir tekrarlar elensin)."""
+    url = find_url(line)
+    if url is not None:
+        return url
+    try:
+        rec = json.loads(line)
+    except ValueError:
+        return None
+    url = rec.get("url") if isinstance(rec, dict) else None
+    if url:
+        return json.dumps(url, ensure_ascii=False)[1:-1].encode("utf-8")
+    return b"\x00" + hashlib.sha1(line).hexdigest().encode("ascii")
+
+
+def partition_of(payload: bytes, granularity: str) -> str:
+    m = DATE_RE.search(payload)
+    dt = parse_datetime(m.group(1).decode("utf-8", "replace")) if m else None
+    if dt is None:
+        return "undated"
+    local = dt.astimezone(TR_TZ)
+    if granularity == "month":
+        return local.strftime("%Y-%m")
+    return local.strftime("%Y-%m-%d")
+
+
+# ---------------------------------------------------------------------
+#  1. AŞAMA: SIRALI PARÇALAR
+# ---------------------------------------------------------------------
+
+
+def write_run(entries: List[Tuple[bytes, int, bytes]], tmp_dir: str) -> str:
+    entries.sort(key=lambda e: (e[0], e[1]))
+    fd, path = tempfile.mkstemp(prefix="run_", suffix=".tmp", dir=tmp_dir)
+    with os.fdopen(fd, "wb") as out:
+        for key, seq, line in entries:
+            out.write(b"%s\t%0*d\t%s" % (key, SEQ_WIDTH, seq, line))
+    return path
+
+
+def make_runs(path: str, tmp_dir: str, memory_bytes: int, stats: Dict[str, int]) -> List[str]:
+    """Dosyayı bellek bütçesine sığan parçalar halinde okuyup sıralı ara dosyalar yazar."""
+    runs: List[str] = []
+    entries: List[Tuple[bytes, int, bytes]] = []
+    used = 0
+    seq = 0
+
+    with open(path, "rb") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            key = record_key(line)
+            if key is None:
+                stats["invalid"] += 1
+                continue
+            seq += 1
+            entries.append((key, seq, line))
+            # satır + anahtar + tuple/nesne ek yükü için kaba tahmin
+            used += len(line) + len(key) + 120
+            if used >= memory_bytes:
+                runs.append(write_run(entries, tmp_dir))
+                entries = []
+                used = 0
+
+    if entries or not runs:
+        runs.append(write_run(entries, tmp_dir))
+    stats["records_in"] = seq
+    return runs
+
+
+# ---------------------------------------------------------------------
+#  2. AŞAMA: BİRLEŞTİRME
+# ---------------------------------------------------------------------
+
+
+def iter_run(fh: BinaryIO) -> Iterator[bytes]:
+    for line in fh:
+        yield line
+
+
+def merge_runs(runs: List[str], tmp_dir: str) -> str:
+    """Ara dosyaları tek bir sıralı dosyada toplar (gerekirse birkaç geçişte)."""
+    while len(runs) > 1:
+        merged: List[str] = []
+        for i in range(0, len(runs), MAX_MERGE_FANIN):
+            group = runs[i:i + MAX_MERGE_FANIN]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            fd, out_path = tempfile.mkstemp(prefix="run_", suffix=".tmp", dir=tmp_dir)
+            handles = [open(p, "rb") for p in group]
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    out.writelines(heapq.merge(*(iter_run(h) for h in handles)))
+            finally:
+                for h in handles:
+                    h.close()
+                for p in group:
+                    os.remove(p)
+            merged.append(out_path)
+        runs = merged
+    return runs[0]
+
+
+def iter_latest(sorted_path: str, stats: Dict[str, int]) -> Iterator[bytes]:
+    """Aynı anahtarlı satırlardan yalnızca en son yazılanı (en büyük sıra) verir."""
+    prev_key: Optional[bytes] = None
+    prev_payload: Optional[bytes] = None
+    with open(sorted_path, "rb") as fh:
+        for line in fh:
+            key, _, payload = line.split(b"\t", 2)
+            if key == prev_key:
+                stats["duplicates"] += 1
+            elif prev_payload is not None:
+                yield prev_payload
+            prev_key, prev_payload = key, payload
+    if prev_payload is not None:
+        yield prev_payload
+
+
+# ---------------------------------------------------------------------
+#  DOSYA BAŞINA SIKIŞTIRMA
+# ---------------------------------------------------------------------
+
+
+class PartitionWriter:
+    """<out_dir>/<dönem>/<dosya adı> dosyalarına yazar; açık dosya sayısı sınırlı."""
+
+    def __init__(self, out_dir: str, name: str):
+        self.out_dir = out_dir
+        self.name = name
+        self.handles: Dict[str, BinaryIO] = {}
+        self.created: set = set()
+
+    def write(self, period: str, payload: bytes) -> None:
+        fh = self.handles.get(period)
+        if fh is None:
+            if len(self.handles) >= MAX_OPEN_PARTITIONS:
+                self.handles.pop(next(iter(self.handles))).close()
+            part_dir = os.path.join(self.out_dir, period)
+            os.makedirs(part_dir, exist_ok=True)
+            # İlk açılışta eski bölüm dosyası ezilir, sonra eklenir.
+            mode = "ab" if period in self.created else "wb"
+            fh = self.handles[period] = open(os.path.join(part_dir, self.name), mode)
+            self.created.add(period)
+        fh.write(payload)
+
+    def close(self) -> None:
+        for fh in self.handles.values():
+            fh.close()
+        self.handles.clear()
+
+
+def compact_file(
+    path: str,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    tmp_dir: Optional[str] = None,
+    partition: Optional[str] = None,
+    partition_dir: Optional[str] = None,
+) -> Dict[str, int]:
+    stats = {"records_in": 0, "records_out": 0, "duplicates": 0, "invalid": 0}
+    started = time.monotonic()
+    size_before = os.path.getsize(path)
+    work_dir = tempfile.mkdtemp(prefix="compact_", dir=tmp_dir or os.path.dirname(path) or ".")
+
+    try:
+        runs = make_runs(path, work_dir, memory_mb * 1024 * 1024, stats)
+        sorted_path = merge_runs(runs, work_dir)
+
+        if partition:
+            writer = PartitionWriter(partition_dir, os.path.basename(path))
+            try:
+                for payload in iter_latest(sorted_path, stats):
+                    writer.write(partition_of(payload, partition), payload)
+                    stats["records_out"] += 1
+            finally:
+                writer.close()
+        else:
+            out_path = os.path.join(work_dir, "compacted.jsonl")
+            with open(out_path, "wb") as out:
+                for payload in iter_latest(sorted_path, stats):
+                    out.write(payload)
+                    stats["records_out"] += 1
+
+            # Scraper bu arada dosyaya yazdıysa o satırları kaybetmemek için dokunma.
+            if os.path.getsize(path) != size_before:
+                print(f"[WARN] {path} changed during compaction, left untouched", file=sys.stderr)
+                stats["skipped"] = 1
+            else:
+                shutil.copymode(path, out_path)
+                os.replace(out_path, path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    stats["bytes_in"] = size_before
+    stats["seconds"] = int(time.monotonic() - started)
+    return stats
+
+
+def _compact_job(job: Tuple[str, int, Optional[str], Optional[str], Optional[str]]):
+    path = job[0]
+    try:
+        return path, compact_file(*job), None
+    except Exception as e:  # bir dosyadaki hata diğerlerini durdurmasın
+        return path, None, str(e)
+
+
+# ---------------------------------------------------------------------
+#  CLI
+# ---------------------------------------------------------------------
+
+
+def find_jsonl_files(paths: List[str]) -> List[str]:
+    files: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(glob.glob(os.path.join(p, "*.jsonl")))
+        else:
+            files.append(p)
+    return sorted(files)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m compactor",
+        description=(
+            "Scraper çıktılarını (*.jsonl) URL'ye göre dış bellekte sıralayıp tekrarları atar; "
+            "her makalenin en son yazılan sürümü kalır. Scraper'lar yazarken çalıştırmayın."
+        ),
+    )
+    parser.add_argument(
+        "paths", nargs="*", default=DEFAULT_DATA_DIRS, help="*.jsonl dosyaları ya da klasörler"
+    )
+    parser.add_argument(
+        "--memory-mb",
+        type=int,
+        default=DEFAULT_MEMORY_MB,
+        help=f"iş başına sıralama belleği (varsayılan: {DEFAULT_MEMORY_MB})",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="paralel dosya sayısı"
+    )
+    parser.add_argument("--tmp-dir", help="ara dosyalar için klasör (varsayılan: girdinin yanı)")
+    parser.add_argument(
+        "--partition",
+        choices=["day", "month"],
+        help="kaynağa dokunmadan <partition-dir>/<dönem>/<dosya adı> olarak tarihe göre böl",
+    )
+    parser.add_argument(
+        "--partition-dir",
+        default="partitioned",
+        help="bölümlenmiş çıktı klasörü (varsayılan: partitioned)",
+    )
+    args = parser.parse_args(argv)
+
+    files = find_jsonl_files(args.paths)
+    if not files:
+        print("[INFO] no *.jsonl files found")
+        return
+
+    partition_dir = args.partition_dir if args.partition else None
+    jobs = [(f, args.memory_mb, args.tmp_dir, args.partition, partition_dir) for f in files]
+    failed = 0
+    with Pool(processes=max(1, min(args.jobs, len(jobs)))) as pool:
+        for path, stats, error in pool.imap_unordered(_compact_job, jobs):
+            if error:
+                failed += 1
+                print(f"[ERROR] {path}: {error}", file=sys.stderr)
+                continue
+            print(
+                f"[INFO] {path}: {stats['records_in']} -> {stats['records_out']} records, "
+                f"{stats['duplicates']} duplicates dropped, {stats['invalid']} invalid lines, "
+                f"{stats['seconds']}s"
+            )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
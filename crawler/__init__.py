@@ -0,0 +1,5 @@
+from crawler.adapter import Page, SourceAdapter
+from crawler.cli import main
+from crawler.engine import Engine
+
+__all__ = ["Engine", "Page", "SourceAdapter", "main"]
@@ -0,0 +1,103 @@
+from typing import Any, Dict, List, Optional
+
+
+class SourceAdapter:
+    """Bir haber ajansını motora tanıtan ince katman.
+
+    Motor; HTTP, zamanlama, tekrar eleme, yazma ve metrikleri üstlenir.
+    Adaptör yalnızca siteye özgü kısımları sağlar: listeleme URL'leri,
+    link çıkarma ve makale alanlarının DOM'dan çıkarılması.
+    """
+
+    # Çıktı dosyası öneki: output/<name>_<slug>.jsonl
+    name: str = ""
+    base_url: str = ""
+    # slug -> kategori adı
+    categories: Dict[str, str] = {}
+
+    user_agent: str = "Mozilla/5.0 (compatible; news-scraper/1.0)"
+    request_delay: float = 0.5
+    max_listing_pages: int = 50
+    # 0 = sınırsız
+    max_per_category: int = 0
+    max_articles: int = 0
+    # Bir listeleme sayfasında bundan az yeni link varsa kategori bitmiş sayılır
+    # (0 = sayfalar bitene kadar devam et).
+    min_new_links_per_page: int = 0
+
+    sitemap_urls: List[str] = []
+    rss_feeds: Dict[str, str] = {}
+
+    def listing_url(self, slug: str) -> str:
+        """Kategorinin ilk listeleme sayfası."""
+        raise NotImplementedError
+
+    def extract_article_links(self, slug: str, listing_url: str, html: str) -> List[str]:
+        """Listeleme sayfasındaki makale URL'leri, sayfadaki sırasıyla."""
+        raise NotImplementedError
+
+    def next_listing_urls(self, slug: str, listing_url: str, html: str, page: int) -> List[str]:
+        """`page`. listeleme sayfasından sonra taranacak sayfalar."""
+        raise NotImplementedError
+
+    def category_for_url(self, url: str) -> Optional[str]:
+        """Sitemap'ten gelen bir makale URL'sinin kategorisi (bilinmiyorsa None)."""
+        return None
+
+    # -----------------------------------------------------------------
+    #  MAKALE SAYFASI
+    # -----------------------------------------------------------------
+    #  Motor title / date_time / body / media_links alanlarını önce JSON-LD ve
+    #  OpenGraph bloklarından okur; yalnızca eksik kalan alanlar için aşağıdaki
+    #  extract_* metotlarını çağırır. DOM (`page.dom`) ilk ihtiyaçta bir kez kurulur.
+
+    def build_dom(self, html: str) -> Any:
+        """DOM sezgilerinin çalışacağı ayrıştırılmış sayfa (ör. BeautifulSoup)."""
+        raise NotImplementedError
+
+    def extract_title(self, page: "Page") -> str:
+        raise NotImplementedError
+
+    def extract_date_time(self, page: "Page") -> str:
+        raise NotImplementedError
+
+    def extract_body(self, page: "Page") -> str:
+        raise NotImplementedError
+
+    def extract_media_links(self, page: "Page") -> List[str]:
+        raise NotImplementedError
+
+    def media_from_metadata(self, page: "Page", media: List[str]) -> List[str]:
+        """JSON-LD / OpenGraph medya listesinden bu sayfa için geçerli olanlar.
+
+        Boş liste dönerse medya DOM'dan çıkarılır (ör. galeri sayfalarında
+        og:image yalnızca kapak görselidir).
+        """
+        return media
+
+    def media_key(self, url: str) -> str:
+        """Aynı medyanın farklı URL'lerini (ör. boyut varyantları) birleştirmek için anahtar."""
+        return url
+
+    def build_record(self, page: "Page", fields: Dict[str, object]) -> Dict[str, object]:
+        """Çıktıya yazılacak kayıt; `fields` title, date_time, body ve media_links içerir."""
+        raise NotImplementedError
+
+
+class Page:
+    """İndirilmiş makale sayfası; DOM yalnızca gerekirse ve bir kez kurulur."""
+
+    def __init__(self, adapter: SourceAdapter, slug: str, url: str, html: str):
+        self.adapter = adapter
+        self.slug = slug
+        self.url = url
+        self.html = html
+        # Adaptörün alanlar arasında paylaştığı ara sonuçlar (ör. sayfa metni)
+        self.cache: Dict[str, Any] = {}
+        self._dom: Any = None
+
+    @property
+    def dom(self) -> Any:
+        if self._dom is None:
+            self._dom = self.adapter.build_dom(self.html)
+        return self._dom
@@ -0,0 +1,84 @@
+import re
+import sys
+import signal
+import argparse
+from typing import List, Optional
+
+from crawler.adapter import SourceAdapter
+from crawler.dates import parse_cli_datetime
+from crawler.engine import Engine
+
+DISCOVERY_MODE = "sitemap"
+
+DURATION_RE = re.compile(r"^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?$")
+
+
+def _datetime_arg(end_of_day: bool):
+    def parse(value: str):
+        try:
+            return parse_cli_datetime(value, end_of_day=end_of_day)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+    return parse
+
+
+def _duration_arg(value: str) -> float:
+    """"600", "600s", "10m", "1h30m" -> saniye."""
+    m = DURATION_RE.match(value.strip().lower())
+    if not m or not any(m.groups()):
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r} (e.g. 600, 10m, 1h30m)")
+    hours, minutes, seconds = (int(g or 0) for g in m.groups())
+    total = hours * 3600 + minutes * 60 + seconds
+    if total <= 0:
+        raise argparse.ArgumentTypeError("duration must be positive")
+    return float(total)
+
+
+def main(adapter: SourceAdapter, argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=f"{adapter.name.upper()} news scraper")
+    parser.add_argument(
+        "--discovery",
+        choices=["sitemap", "listing"],
+        default=DISCOVERY_MODE,
+        help="sitemap: sitemap + RSS, listing pages only as fallback; listing: listing pages only",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="run forever, polling each category's first listing page on an adaptive schedule",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=_duration_arg,
+        metavar="DURATION",
+        help="stop after DURATION (e.g. 600, 10m, 1h30m); crawls listing pages of all "
+        "categories interleaved, first pages and newest articles first",
+    )
+    parser.add_argument(
+        "--since",
+        type=_datetime_arg(end_of_day=False),
+        metavar="DATE",
+        help="only keep articles published at/after DATE (YYYY-MM-DD or ISO-8601); "
+        "stop paginating a category once its pages are older",
+    )
+    parser.add_argument(
+        "--until",
+        type=_datetime_arg(end_of_day=True),
+        metavar="DATE",
+        help="only keep articles published at/before DATE (a bare date means end of that day)",
+    )
+    args = parser.parse_args(argv)
+    if args.daemon and args.time_budget:
+        parser.error("--daemon and --time-budget cannot be combined")
+
+    engine = Engine(adapter, since=args.since, until=args.until)
+    if args.daemon or args.time_budget:
+        # "docker stop" / cron zaman aşımı SIGTERM gönderir; dosyalar düzgün kapansın.
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    if args.daemon:
+        engine.run_daemon()
+    elif args.time_budget:
+        engine.run_budgeted(args.time_budget)
+    else:
+        engine.run(args.discovery)
@@ -0,0 +1,111 @@
+import re
+from datetime import datetime, time, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Türkiye 2016'dan beri yaz saati uygulamıyor: sabit UTC+3.
+TR_TZ = timezone(timedelta(hours=3))
+
+TR_MONTHS: Dict[str, int] = {
+    "ocak": 1, "oca": 1,
+    "şubat": 2, "şub": 2, "subat": 2, "sub": 2,
+    "mart": 3, "mar": 3,
+    "nisan": 4, "nis": 4,
+    "mayıs": 5, "may": 5, "mayis": 5,
+    "haziran": 6, "haz": 6,
+    "temmuz": 7, "tem": 7,
+    "ağustos": 8, "ağu": 8, "agustos": 8, "agu": 8,
+    "eylül": 9, "eyl": 9, "eylul": 9,
+    "ekim": 10, "eki": 10,
+    "kasım": 11, "kas": 11, "kasim": 11,
+    "aralık": 12, "ara": 12, "aralik": 12,
+}
+
+_TR_UPPER = str.maketrans({"İ": "i", "I": "ı"})
+
+ISO_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?)?"
+    r"\s*(Z|[+-]\d{2}:?\d{2})?"
+)
+# "14.11.2025 - 16:02", "14/11/2025 16:02"
+DOTTED_RE = re.compile(
+    r"(\d{1,2})[./](\d{1,2})[./](\d{4})(?:\D{0,5}?(\d{1,2}):(\d{2})(?::(\d{2}))?)?"
+)
+# "14 Kasım 2025 16:02", "14 KASIM 2025 Cuma 16:02"
+TEXT_RE = re.compile(
+    r"(\d{1,2})\s+([^\W\d_]+)\.?\s+(\d{4})(?:[^0-9]{0,30}?(\d{1,2}):(\d{2})(?::(\d{2}))?)?"
+)
+# RSS pubDate: "Fri, 14 Nov 2025 10:00:00 +0300"
+RFC822_RE = re.compile(r"^[A-Za-z]{3},\s")
+
+
+def _tzinfo(value: Optional[str]) -> timezone:
+    if not value:
+        return TR_TZ
+    if value == "Z":
+        return timezone.utc
+    sign = -1 if value[0] == "-" else 1
+    digits = value[1:].replace(":", "")
+    return timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:4])))
+
+
+def _build(year, month, day, hour, minute, second, tz: timezone) -> datetime:
+    return datetime(
+        int(year), int(month), int(day),
+        int(hour or 0), int(minute or 0), int(second or 0),
+        tzinfo=tz,
+    )
+
+
+def parse_datetime(value: str) -> Optional[datetime]:
+    """Ajansların tarih metinlerini saat dilimli datetime'a çevirir.
+
+    Saat dilimi belirtilmemişse Türkiye saati (UTC+3) kabul edilir.
+    Çözülemezse None döner.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+
+    try:
+        m = ISO_RE.search(value)
+        if m:
+            return _build(*m.groups()[:6], _tzinfo(m.group(7)))
+
+        if RFC822_RE.match(value):
+            dt = parsedate_to_datetime(value)
+            return dt if dt.tzinfo else dt.replace(tzinfo=TR_TZ)
+
+        m = DOTTED_RE.search(value)
+        if m:
+            day, month, year, hour, minute, second = m.groups()
+            return _build(year, month, day, hour, minute, second, TR_TZ)
+
+        for m in TEXT_RE.finditer(value):
+            month = TR_MONTHS.get(m.group(2).translate(_TR_UPPER).lower())
+            if month:
+                day, _, year, hour, minute, second = m.groups()
+                return _build(year, month, day, hour, minute, second, TR_TZ)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+    return None
+
+
+def normalize_date_time(value: str) -> str:
+    """ISO-8601, Türkiye saatine çevrilmiş (ör. 2025-11-14T16:02:00+03:00); çözülemezse ""."""
+    dt = parse_datetime(value)
+    if dt is None:
+        return ""
+    return dt.astimezone(TR_TZ).isoformat(timespec="seconds")
+
+
+def parse_cli_datetime(value: str, end_of_day: bool = False) -> datetime:
+    """`--since` / `--until` argümanı; yalnızca tarih verilmişse günün başı (ya da sonu)."""
+    dt = parse_datetime(value)
+    if dt is None:
+        raise ValueError(f"unrecognized date: {value!r}")
+    if end_of_day and re.fullmatch(r"\s*\d{4}-\d{2}-\d{2}\s*", value):
+        dt = datetime.combine(dt.date(), time.max, tzinfo=dt.tzinfo)
+    return dt
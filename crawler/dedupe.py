@@ -0,0 +1,54 @@
+import os
+import re
+import json
+from typing import Iterable, List, Optional, Set
+
+# json.dumps çıktısında üst seviye "url" alanı; gövde metnindeki tırnaklar
+# kaçışlı (\") olduğundan yanlış eşleşmez.
+URL_RE = re.compile(rb'"url":\s*"((?:[^"\\]|\\.)*)"')
+
+
+def find_url(line: bytes) -> Optional[bytes]:
+    """JSONL satırındaki "url" değeri, JSON kaçışlarıyla birlikte ham haliyle.
+
+    Satırı baştan sona regex ile taramak yerine anahtar önce bytes.find ile
+    bulunur; uzun gövdeli kayıtlarda belirgin şekilde hızlıdır.
+    """
+    i = line.find(b'"url":')
+    while i >= 0:
+        m = URL_RE.match(line, i)
+        if m:
+            return m.group(1)
+        i = line.find(b'"url":', i + 1)
+    return None
+
+
+def unique(items: Iterable[str]) -> List[str]:
+    """Sırayı koruyarak tekrarları atar."""
+    return list(dict.fromkeys(items))
+
+
+def load_seen_urls(output_dir: str, prefix: str) -> Set[str]:
+    """Önceki çalıştırmaların çıktılarındaki URL'ler (`<prefix>_*.jsonl`).
+
+    Satırlar JSON olarak parse edilmez; büyük çıktılarda yalnızca "url"
+    alanı okunur.
+    """
+    seen: Set[str] = set()
+    if not os.path.isdir(output_dir):
+        return seen
+    for name in os.listdir(output_dir):
+        if not (name.startswith(f"{prefix}_") and name.endswith(".jsonl")):
+            continue
+        with open(os.path.join(output_dir, name), "rb") as fh:
+            for line in fh:
+                raw = find_url(line)
+                if raw is None:
+                    continue
+                try:
+                    # Kaçış içermeyen (neredeyse tüm) URL'lerde JSON çözümü gerekmez.
+                    url = json.loads(b'"' + raw + b'"') if b"\\" in raw else raw.decode("utf-8")
+                except ValueError:
+                    continue
+                seen.add(url)
+    return seen
@@ -0,0 +1,223 @@
+import os
+import re
+import json
+import zlib
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+from crawler.adapter import SourceAdapter
+from crawler.dates import parse_datetime
+from crawler.fetch import Fetcher
+
+# ---------------------------------------------------------------------
+#  SITEMAP / RSS KEŞFİ
+# ---------------------------------------------------------------------
+
+MAX_SITEMAP_DEPTH = 3
+XML_ENTRY_TAGS = {"url", "sitemap", "item", "entry"}
+
+
+def xml_local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def iter_xml_entries(
+    fetcher: Fetcher, url: str, failed: Optional[Set[str]] = None
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Sitemap / RSS / Atom belgesini akış halinde okuyup her girdiyi verir.
+
+    Belge bütünüyle belleğe alınmaz: parçalar geldikçe XMLPullParser'a
+    beslenir ve işlenen girdiler hemen temizlenir. ``.xml.gz`` de desteklenir.
+    İndirilemeyen ya da yarıda bozulan belgeler `failed` kümesine eklenir.
+    """
+    resp = fetcher.stream(url)
+    if resp is None:
+        if failed is not None:
+            failed.add(url)
+        return
+
+    with resp:
+        parser = ET.XMLPullParser(events=("end",))
+        gunzip = None
+        first = True
+        try:
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                fetcher.metrics.incr("bytes", len(chunk))
+                if first:
+                    first = False
+                    if chunk[:2] == b"\x1f\x8b":
+                        gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                if gunzip is not None:
+                    chunk = gunzip.decompress(chunk)
+                parser.feed(chunk)
+
+                for _, elem in parser.read_events():
+                    name = xml_local_name(elem.tag)
+                    if name not in XML_ENTRY_TAGS:
+                        continue
+                    fields: Dict[str, str] = {}
+                    for child in elem.iter():
+                        if child is elem:
+                            continue
+                        key = xml_local_name(child.tag)
+                        value = (child.text or "").strip() or child.get("href", "")
+                        if value and key not in fields:
+                            fields[key] = value
+                    yield name, fields
+                    elem.clear()
+        except (ET.ParseError, zlib.error) as e:
+            print(f"[WARN] XML parse error {url}: {e}")
+            if failed is not None:
+                failed.add(url)
+
+
+def entry_version(fields: Dict[str, str]) -> str:
+    for key in ("lastmod", "publication_date", "pubdate", "updated", "published"):
+        if fields.get(key):
+            return fields[key]
+    return ""
+
+
+def sitemap_roots(adapter: SourceAdapter, fetcher: Fetcher) -> List[str]:
+    roots: List[str] = list(adapter.sitemap_urls)
+    robots = fetcher.get_text(f"{adapter.base_url}/robots.txt")
+    if robots:
+        for m in re.finditer(r"^\s*sitemap:\s*(\S+)", robots, re.IGNORECASE | re.MULTILINE):
+            if m.group(1) not in roots:
+                roots.append(m.group(1))
+    return roots
+
+
+# ---------------------------------------------------------------------
+#  DURUM DOSYASI
+# ---------------------------------------------------------------------
+
+
+def load_sitemap_state(path: str) -> Dict[str, Dict[str, str]]:
+    state: Dict[str, Dict[str, str]] = {"urls": {}, "sitemaps": {}, "covered": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            state.update(json.load(fh))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[WARN] cannot read {path}: {e}")
+    return state
+
+
+def save_sitemap_state(path: str, state: Dict[str, Dict[str, str]]) -> None:
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def discover_articles(
+    adapter: SourceAdapter,
+    fetcher: Fetcher,
+    state: Dict[str, Dict[str, str]],
+    since: Optional[datetime] = None,
+) -> Tuple[
+    Dict[str, List[Tuple[str, str]]], Dict[str, str], Dict[str, List[str]], bool
+]:
+    """Sitemap'ler ve kategori RSS'lerinden (url, version) adaylarını toplar.
+
+    İkinci değer, bu çalıştırmada okunan alt sitemap'lerin lastmod'larıdır;
+    üçüncüsü her alt sitemap'in içerdiği aday makaleler ve alt sitemap'lerdir.
+    Bir sitemap, `completed_sitemaps` ile içindekilerin hepsi işlendikten
+    sonra state'e yazılmalıdır. Dördüncü değer, sitemap ağacına ulaşılıp
+    ulaşılamadığıdır. `since` verilirse lastmod'u ondan eski alt sitemap'ler
+    hiç indirilmez.
+    """
+    found: Dict[str, Dict[str, str]] = {}
+    sitemap_marks: Dict[str, str] = {}
+    members: Dict[str, List[str]] = {}
+    failed: Set[str] = set()
+    requests_before = fetcher.metrics.counters.get("requests", 0)
+    skipped_sitemaps = 0
+    reachable = False
+
+    queue: List[Tuple[str, int]] = [(u, 0) for u in sitemap_roots(adapter, fetcher)]
+    visited: Set[str] = set()
+    while queue:
+        sm_url, depth = queue.pop(0)
+        if sm_url in visited:
+            continue
+        visited.add(sm_url)
+
+        print(f"[INFO] sitemap: {sm_url}")
+        for name, fields in iter_xml_entries(fetcher, sm_url, failed):
+            reachable = True
+            loc = fields.get("loc", "")
+            if not loc:
+                continue
+            if name == "sitemap":
+                lastmod = fields.get("lastmod", "")
+                if lastmod and state["sitemaps"].get(loc) == lastmod:
+                    skipped_sitemaps += 1
+                    continue
+                if since is not None and lastmod:
+                    modified = parse_datetime(lastmod)
+                    if modified is not None and modified < since:
+                        skipped_sitemaps += 1
+                        continue
+                if depth < MAX_SITEMAP_DEPTH:
+                    sitemap_marks[loc] = lastmod
+                    members.setdefault(sm_url, []).append(loc)
+                    queue.append((loc, depth + 1))
+                continue
+
+            slug = adapter.category_for_url(loc)
+            if slug:
+                found.setdefault(slug, {}).setdefault(loc, entry_version(fields))
+                members.setdefault(sm_url, []).append(loc)
+
+    for slug, feed_url in adapter.rss_feeds.items():
+        print(f"[INFO] rss: {feed_url}")
+        for _, fields in iter_xml_entries(fetcher, feed_url):
+            link = fields.get("link") or fields.get("loc") or ""
+            if not link:
+                continue
+            link = urljoin(adapter.base_url, link)
+            found.setdefault(slug, {}).setdefault(link, entry_version(fields))
+
+    total = sum(len(v) for v in found.values())
+    requests_made = fetcher.metrics.counters.get("requests", 0) - requests_before
+    print(
+        f"[INFO] discovery: {requests_made} requests, {total} article URLs, "
+        f"{skipped_sitemaps} unchanged/out-of-window sitemaps skipped"
+    )
+    for sm_url in failed:
+        # Okunamayan sitemap (ve onu içeren üst sitemap) tamamlanmış sayılmaz.
+        sitemap_marks.pop(sm_url, None)
+
+    candidates = {slug: list(urls.items()) for slug, urls in found.items()}
+    return candidates, sitemap_marks, members, reachable
+
+
+def completed_sitemaps(
+    sitemap_marks: Dict[str, str], members: Dict[str, List[str]], handled: Set[str]
+) -> Dict[str, str]:
+    """Tüm makaleleri işlenmiş (kaydedilmiş ya da bilerek atlanmış) ve tüm alt
+    sitemap'leri tamamlanmış sitemap'lerin lastmod'ları.
+
+    İndirilemeyen ya da limit yüzünden kalan makalesi olan sitemap işaretlenmez;
+    sonraki çalıştırma onu yeniden okur.
+    """
+    done: Dict[str, bool] = {}
+
+    def complete(loc: str) -> bool:
+        if loc not in done:
+            done[loc] = False  # döngüye karşı
+            done[loc] = all(
+                complete(m) if m in sitemap_marks else m in handled
+                for m in members.get(loc, [])
+            )
+        return done[loc]
+
+    return {loc: lastmod for loc, lastmod in sitemap_marks.items() if complete(loc)}
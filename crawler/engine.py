@@ -0,0 +1,570 @@
+import os
+import time
+import heapq
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from crawler.adapter import Page, SourceAdapter
+from crawler.dates import normalize_date_time, parse_datetime
+from crawler.dedupe import load_seen_urls, unique
+from crawler.discovery import (
+    completed_sitemaps,
+    discover_articles,
+    load_sitemap_state,
+    save_sitemap_state,
+)
+from crawler.fetch import Fetcher
+from crawler.metadata import MEDIA_COVER, TIERED_FIELDS, extract_metadata
+from crawler.metrics import Metrics
+from crawler.writer import JsonlWriter
+
+# ---------------------------------------------------------------------
+#  AYARLAR
+# ---------------------------------------------------------------------
+
+OUTPUT_DIR = "output"
+
+# Daemon modu: her kategorinin ilk listeleme sayfası, gözlenen yayın hızına
+# göre ayarlanan aralıklarla yoklanır (hedef: yoklama başına ~N yeni haber).
+DAEMON_INITIAL_INTERVAL = 300.0
+DAEMON_MIN_INTERVAL = 60.0
+DAEMON_MAX_INTERVAL = 3600.0
+DAEMON_TARGET_NEW_PER_POLL = 2.0
+DAEMON_RATE_SMOOTHING = 0.3
+
+# --since / --until penceresine göre bir makalenin konumu
+TOO_OLD = -1
+IN_WINDOW = 0
+TOO_NEW = 1
+
+# --time-budget zamanlayıcısında iş türleri; aynı tazelik sırasında listeleme önce gelir
+LISTING_TASK = 0
+ARTICLE_TASK = 1
+
+
+def next_poll_interval(poll: Dict[str, float], new_count: int, now: float) -> float:
+    """Yayın hızını (haber/sn) EWMA ile günceller ve bir sonraki aralığı döner."""
+    if not poll["polls"]:
+        # İlk yoklamadaki haberler birikmiş stoktur, yayın hızı değil.
+        poll["polls"] = 1
+        poll["last"] = now
+        return poll["interval"]
+
+    poll["polls"] += 1
+    elapsed = max(now - poll["last"], 1.0)
+    observed = new_count / elapsed
+    if poll["polls"] == 2:
+        # İlk gerçek ölçüm olduğu gibi alınır; 0'dan yumuşatılsa gözlenenin %30'u olurdu.
+        poll["rate"] = observed
+    else:
+        poll["rate"] = (
+            DAEMON_RATE_SMOOTHING * observed + (1 - DAEMON_RATE_SMOOTHING) * poll["rate"]
+        )
+    poll["last"] = now
+
+    if poll["rate"] > 0:
+        interval = DAEMON_TARGET_NEW_PER_POLL / poll["rate"]
+    else:
+        interval = poll["interval"] * 2
+    poll["interval"] = min(max(interval, DAEMON_MIN_INTERVAL), DAEMON_MAX_INTERVAL)
+    return poll["interval"]
+
+
+class Engine:
+    """Adaptörden bağımsız tarama döngüsü (tek seferlik ve daemon)."""
+
+    def __init__(
+        self,
+        adapter: SourceAdapter,
+        output_dir: str = OUTPUT_DIR,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ):
+        self.adapter = adapter
+        self.output_dir = output_dir
+        self.since = since
+        self.until = until
+        self.metrics = Metrics()
+        self.fetcher = Fetcher(adapter.user_agent, adapter.request_delay, self.metrics)
+        self.writer = JsonlWriter(output_dir, adapter.name)
+        self.seen_urls: Set[str] = set()
+        self.total_saved = 0
+
+    # -----------------------------------------------------------------
+    #  ORTAK
+    # -----------------------------------------------------------------
+
+    def limit_reached(self, saved_in_category: int) -> bool:
+        a = self.adapter
+        if a.max_articles and self.total_saved >= a.max_articles:
+            return True
+        if a.max_per_category and saved_in_category >= a.max_per_category:
+            return True
+        return False
+
+    def window_position(self, value: str) -> int:
+        """Tarih metninin --since/--until penceresine göre konumu (tarihsizler içeride sayılır)."""
+        if self.since is None and self.until is None:
+            return IN_WINDOW
+        dt = parse_datetime(value)
+        if dt is None:
+            return IN_WINDOW
+        if self.since is not None and dt < self.since:
+            return TOO_OLD
+        if self.until is not None and dt > self.until:
+            return TOO_NEW
+        return IN_WINDOW
+
+    def extract_fields(self, page: Page) -> Tuple[Dict[str, object], Dict[str, str]]:
+        """title / date_time / body / media_links değerleri ve geldikleri katman.
+
+        Önce JSON-LD / OpenGraph okunur; adaptörün DOM sezgileri yalnızca
+        eksik kalan alanlar için çalışır.
+        """
+        a = self.adapter
+        meta = extract_metadata(page.html, a.base_url)
+        fields: Dict[str, object] = {}
+        tiers: Dict[str, str] = {}
+
+        for field, extract in (
+            ("title", a.extract_title),
+            ("date_time", a.extract_date_time),
+            ("body", a.extract_body),
+        ):
+            if field in meta:
+                tiers[field], fields[field] = meta[field]
+            else:
+                tiers[field], fields[field] = "dom", extract(page)
+
+        media: List[str] = []
+        if "media_links" in meta:
+            tiers["media_links"], found = meta["media_links"]
+            media = a.media_from_metadata(page, list(found))
+        if not media:
+            # Tek bir paylaşım görseli makalenin medyası değildir: DOM yine taranır,
+            # bulunanlar metadata URL'lerinin arkasına eklenir.
+            tier, cover = meta.get(MEDIA_COVER, ("dom", []))
+            media = a.media_from_metadata(page, list(cover)) if cover else []
+            keys = {a.media_key(u) for u in media}
+            added = 0
+            for u in a.extract_media_links(page):
+                key = a.media_key(u)
+                if key not in keys:
+                    keys.add(key)
+                    media.append(u)
+                    added += 1
+            tiers["media_links"] = "dom" if added else tier
+        fields["media_links"] = media
+        return fields, tiers
+
+    def fetch_article(self, slug: str, url: str) -> Optional[Dict[str, object]]:
+        html = self.fetcher.get_text(url)
+        if html is None:
+            return None
+
+        started = time.perf_counter()
+        page = Page(self.adapter, slug, url, html)
+        fields, tiers = self.extract_fields(page)
+        record = self.adapter.build_record(page, fields)
+
+        # Her alanı hangi katmanın doldurduğu: jsonld / og / dom / missing
+        for field in TIERED_FIELDS:
+            self.metrics.incr(f"tier.{field}.{tiers[field] if fields[field] else 'missing'}")
+
+        raw = str(record.get("date_time") or "")
+        record["date_time"] = normalize_date_time(raw)
+        record["date_time_raw"] = raw
+        self.metrics.add_time("parse", time.perf_counter() - started)
+        return record
+
+    def save_article(
+        self, slug: str, url: str, record: Optional[Dict[str, object]] = None
+    ) -> Optional[int]:
+        """Makaleyi (gerekirse indirip) pencere içindeyse yazar.
+
+        İndirilemezse None, aksi halde `window_position` sonucunu döner;
+        yalnızca IN_WINDOW olanlar dosyaya yazılır.
+        """
+        if record is None:
+            record = self.fetch_article(slug, url)
+            if record is None:
+                return None
+        self.seen_urls.add(url)
+
+        position = self.window_position(str(record["date_time"]))
+        if position != IN_WINDOW:
+            self.metrics.incr("articles_outside_window")
+            return position
+
+        self.writer.write(slug, record)
+        self.total_saved += 1
+        self.metrics.incr("articles_saved")
+        print(f"[INFO]     saved {url}")
+        return IN_WINDOW
+
+    # -----------------------------------------------------------------
+    #  LİSTELEME SAYFALARI
+    # -----------------------------------------------------------------
+
+    def crawl_listing(self, slug: str) -> int:
+        a = self.adapter
+        start_url = a.listing_url(slug)
+        queue: List[Tuple[str, int]] = [(start_url, 1)]
+        visited: Set[str] = set()
+        count = 0
+
+        while queue and len(visited) < a.max_listing_pages and not self.limit_reached(count):
+            url, page = queue.pop(0)
+            if url in visited:
+                continue
+            visited.add(url)
+
+            print(f"[INFO] [{slug}] listing page {page}: {url}")
+            html = self.fetcher.get_text(url)
+            if not html:
+                continue
+            self.metrics.incr("listing_pages")
+
+            links = a.extract_article_links(slug, url, html)
+            new_links = [u for u in links if u not in self.seen_urls]
+            print(f"[INFO]   found {len(links)} links, {len(new_links)} new")
+            if not new_links and a.min_new_links_per_page:
+                print(f"[INFO] [{slug}] no new links, stop.")
+                break
+
+            for next_url in a.next_listing_urls(slug, url, html, page):
+                if next_url not in visited:
+                    queue.append((next_url, page + 1))
+
+            records: Dict[str, Dict[str, object]] = {}
+
+            if self.until is not None and new_links:
+                # Listeler yeniden eskiye sıralı: sayfanın en eski haberi bile
+                # --until'den yeniyse sayfanın geri kalanını indirmeye gerek yok.
+                probe = new_links[-1]
+                rec = self.fetch_article(slug, probe)
+                probe_date = str(rec["date_time"]) if rec else ""
+                if rec:
+                    records[probe] = rec
+                    self.seen_urls.add(probe)
+                if self.window_position(probe_date) == TOO_NEW:
+                    print(f"[INFO] [{slug}] page {page} is newer than --until, skipping its articles")
+                    self.metrics.incr("listing_pages_skipped")
+                    continue
+
+            positions: List[int] = []
+            for article_url in new_links:
+                if self.limit_reached(count):
+                    break
+                position = self.save_article(slug, article_url, records.get(article_url))
+                if position is None:
+                    continue
+                positions.append(position)
+                if position == IN_WINDOW:
+                    count += 1
+
+            if self.since is not None and positions and all(p == TOO_OLD for p in positions):
+                print(f"[INFO] [{slug}] page {page} is older than --since, stop.")
+                break
+
+            if len(new_links) < a.min_new_links_per_page:
+                print(f"[INFO] [{slug}] very few new links, probably end. stop.")
+                break
+
+        print(f"[INFO] [{slug}] listing pages={len(visited)}, total saved: {count}")
+        return count
+
+    # -----------------------------------------------------------------
+    #  SITEMAP / RSS
+    # -----------------------------------------------------------------
+
+    def crawl_discovered(
+        self,
+        slug: str,
+        candidates: List[Tuple[str, str]],
+        state: Dict[str, Dict[str, str]],
+        handled: Set[str],
+    ) -> int:
+        """Adayları tarar; kaydedilen ya da bilerek atlanan URL'ler `handled`'a eklenir."""
+        # lastmod'u değişmemiş (ya da lastmod'suz ve daha önce görülmüş) makaleleri atla;
+        # lastmod'u --since'ten eski olanlar da o tarihten önce yayımlanmıştır.
+        known = state["urls"]
+        todo = []
+        for u, v in candidates:
+            if (
+                u in self.seen_urls
+                or (u in known and known[u] == v)
+                or (v and self.window_position(v) == TOO_OLD)
+            ):
+                handled.add(u)
+            else:
+                todo.append((u, v))
+        print(
+            f"[INFO] [{slug}] discovered {len(candidates)} URLs, "
+            f"{len(todo)} new or changed"
+        )
+
+        count = 0
+        for article_url, version in todo:
+            if self.limit_reached(count):
+                break
+            position = self.save_article(slug, article_url)
+            if position is not None:
+                handled.add(article_url)
+            if position == IN_WINDOW:
+                # Pencere dışı kalanlar yazılmadı; sonraki normal çalıştırma almalı.
+                known[article_url] = version
+                count += 1
+
+        print(f"[INFO] [{slug}] total saved: {count}")
+        return count
+
+    # -----------------------------------------------------------------
+    #  TEK SEFERLİK TARAMA
+    # -----------------------------------------------------------------
+
+    def run(self, discovery: str = "sitemap") -> None:
+        a = self.adapter
+        print(f"[INFO] Output dir: {self.output_dir}")
+        print(f"[INFO] Max per category: {a.max_per_category or 'no-limit'}")
+        print(f"[INFO] Max listing pages per category: {a.max_listing_pages}")
+        print(f"[INFO] Discovery: {discovery}")
+        if self.since is not None or self.until is not None:
+            print(f"[INFO] Time window: {self.since or '-'} .. {self.until or '-'}")
+        print(f"[INFO] Categories: {', '.join(a.categories)}")
+
+        state_path = os.path.join(self.output_dir, f"{a.name}_sitemap_state.json")
+        state: Dict[str, Dict[str, str]] = {}
+        candidates: Dict[str, List[Tuple[str, str]]] = {}
+        sitemap_marks: Dict[str, str] = {}
+        members: Dict[str, List[str]] = {}
+        handled: Set[str] = set()
+        covered: Set[str] = set()
+        if discovery == "sitemap":
+            state = load_sitemap_state(state_path)
+            candidates, sitemap_marks, members, reachable = discover_articles(
+                a, self.fetcher, state, since=self.since
+            )
+            # Alt sitemap'i değişmediği için atlanan kategoriler de "kapsanmış" sayılır.
+            covered = set(candidates)
+            if reachable:
+                covered.update(state["covered"])
+
+        try:
+            for slug in a.categories:
+                if a.max_articles and self.total_saved >= a.max_articles:
+                    print("[INFO] Global article limit reached, stopping.")
+                    break
+
+                if slug in covered:
+                    self.crawl_discovered(slug, candidates.get(slug, []), state, handled)
+                else:
+                    if discovery == "sitemap":
+                        print(f"[INFO] [{slug}] not covered by sitemap/RSS, falling back to listing pages")
+                    self.crawl_listing(slug)
+
+            # --since/--until ile taranan sitemap'ler yalnızca kısmen kaydedildi;
+            # "değişmedi" diye işaretlenirlerse sonraki normal çalıştırma atlar.
+            if discovery == "sitemap" and self.since is None and self.until is None:
+                # İndirilemeyen ya da limit yüzünden kalan makalesi olan sitemap'ler
+                # işaretlenmez; sonraki çalıştırma onları yeniden okur.
+                state["sitemaps"].update(completed_sitemaps(sitemap_marks, members, handled))
+                state["covered"].update({slug: "1" for slug in candidates})
+
+            print(f"[INFO] ALL DONE. Total articles saved: {self.total_saved}")
+        finally:
+            if discovery == "sitemap":
+                save_sitemap_state(state_path, state)
+            self.writer.close()
+            self.metrics.report(a.name)
+
+    # -----------------------------------------------------------------
+    #  ZAMAN BÜTÇELİ TARAMA
+    # -----------------------------------------------------------------
+
+    def run_budgeted(self, budget: float) -> None:
+        """Listeleme sayfalarını ve makaleleri tüm kategoriler arasında tazelik
+        sırasıyla, süre dolana kadar tarar.
+
+        Bir işin sırası, kategorisinde ondan daha yeni olduğu tahmin edilen
+        haber sayısıdır: önce bütün kategorilerin ilk sayfaları, sonra her
+        kategorinin en yeni haberleri dönüşümlü indirilir; sonraki sayfa, bir
+        önceki sayfanın haberlerinin sırası geldiğinde istenir. Süre dolunca
+        sürmekte olan istek biter, yeni iş başlatılmaz.
+        """
+        a = self.adapter
+        # Süre duvar saatidir (ör. cron penceresi): bilinen URL'lerin okunması da sayılır.
+        started = time.monotonic()
+        deadline = started + budget
+        self.seen_urls = load_seen_urls(self.output_dir, a.name)
+        print(f"[INFO] Output dir: {self.output_dir}")
+        print(
+            f"[INFO] Time budget: {budget:.0f}s, {len(self.seen_urls)} known URLs loaded "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+        if self.since is not None or self.until is not None:
+            print(f"[INFO] Time window: {self.since or '-'} .. {self.until or '-'}")
+        print(f"[INFO] Categories: {', '.join(a.categories)}")
+
+        # (tazelik sırası, iş türü, ekleme sırası, slug, url, sayfa, makalenin listeleme sayfası)
+        tasks: List[Tuple[int, int, int, str, str, int, str]] = []
+        seq = 0
+        for slug in a.categories:
+            seq += 1
+            tasks.append((0, LISTING_TASK, seq, slug, a.listing_url(slug), 1, ""))
+        heapq.heapify(tasks)
+
+        visited: Set[str] = set()
+        queued: Set[str] = set()
+        pages: Dict[str, int] = {slug: 0 for slug in a.categories}
+        saved: Dict[str, int] = {slug: 0 for slug in a.categories}
+        # --since'ten eski sayfaya ulaşan kategoriler: yeni sayfa istenmez,
+        # kuyruktaki makaleleri yine indirilir.
+        stopped: Set[str] = set()
+        # listeleme URL'si -> [kalan makale, --since'ten eski çıkan, yeni link sayısı]
+        page_left: Dict[str, List[int]] = {}
+
+        try:
+            while tasks:
+                if time.monotonic() >= deadline:
+                    left = sum(1 for t in tasks if t[1] == ARTICLE_TASK or t[3] not in stopped)
+                    print(f"[INFO] Time budget exhausted, {left} queued tasks left.")
+                    self.metrics.incr("budget_tasks_left", left)
+                    break
+                if a.max_articles and self.total_saved >= a.max_articles:
+                    print("[INFO] Global article limit reached, stopping.")
+                    break
+
+                rank, kind, _, slug, url, page, listing = heapq.heappop(tasks)
+
+                if kind == ARTICLE_TASK:
+                    if self.limit_reached(saved[slug]):
+                        continue
+                    position = self.save_article(slug, url)
+                    if position == IN_WINDOW:
+                        saved[slug] += 1
+                        self.writer.flush()
+                    state = page_left[listing]
+                    state[0] -= 1
+                    if position == TOO_OLD:
+                        state[1] += 1
+                    if (
+                        self.since is not None
+                        and slug not in stopped
+                        and state[0] == 0
+                        and state[1] == state[2]
+                    ):
+                        print(f"[INFO] [{slug}] page {page} is older than --since, stop.")
+                        stopped.add(slug)
+                    continue
+
+                if slug in stopped or url in visited or pages[slug] >= a.max_listing_pages:
+                    continue
+                visited.add(url)
+                pages[slug] += 1
+
+                print(f"[INFO] [{slug}] listing page {page}: {url}")
+                html = self.fetcher.get_text(url)
+                if not html:
+                    continue
+                self.metrics.incr("listing_pages")
+
+                links = a.extract_article_links(slug, url, html)
+                new_links = [u for u in links if u not in self.seen_urls and u not in queued]
+                print(f"[INFO]   found {len(links)} links, {len(new_links)} new")
+                page_left[url] = [len(new_links), 0, len(new_links)]
+                for i, article_url in enumerate(new_links):
+                    seq += 1
+                    queued.add(article_url)
+                    heapq.heappush(
+                        tasks, (rank + i, ARTICLE_TASK, seq, slug, article_url, page, url)
+                    )
+
+                if len(new_links) < a.min_new_links_per_page:
+                    print(f"[INFO] [{slug}] very few new links, no more pages.")
+                    continue
+                for next_url in a.next_listing_urls(slug, url, html, page):
+                    if next_url not in visited:
+                        seq += 1
+                        heapq.heappush(
+                            tasks,
+                            (rank + len(links), LISTING_TASK, seq, slug, next_url, page + 1, ""),
+                        )
+
+            for slug in a.categories:
+                print(f"[INFO] [{slug}] listing pages={pages[slug]}, total saved: {saved[slug]}")
+            print(f"[INFO] ALL DONE. Total articles saved: {self.total_saved}")
+        finally:
+            self.writer.close()
+            self.metrics.report(a.name)
+
+    # -----------------------------------------------------------------
+    #  DAEMON
+    # -----------------------------------------------------------------
+
+    def run_daemon(self) -> None:
+        a = self.adapter
+        self.seen_urls = load_seen_urls(self.output_dir, a.name)
+        print(f"[INFO] daemon: {len(self.seen_urls)} known URLs loaded from {self.output_dir}")
+
+        start = time.monotonic()
+        polls: Dict[str, Dict[str, float]] = {
+            slug: {"interval": DAEMON_INITIAL_INTERVAL, "rate": 0.0, "last": start, "polls": 0}
+            for slug in a.categories
+        }
+        # (zaman, sıra, slug): ilk turda kategoriler tanım sırasıyla yoklanır
+        schedule: List[Tuple[float, int, str]] = [
+            (start, i, slug) for i, slug in enumerate(a.categories)
+        ]
+        heapq.heapify(schedule)
+
+        # (-kategori hızı, sıra, url, slug): yoğun kategorilerin haberleri önce
+        pending: List[Tuple[float, int, str, str]] = []
+        queued: Set[str] = set()
+        seq = 0
+
+        try:
+            while True:
+                now = time.monotonic()
+
+                # Vakti gelen yoklamalar makale indirmekten önce gelir.
+                while schedule and schedule[0][0] <= now:
+                    _, order, slug = heapq.heappop(schedule)
+                    url = a.listing_url(slug)
+                    html = self.fetcher.get_text(url)
+                    if html is None:
+                        # Kesinti yayın hızı değildir: hızı güncellemeden aynı aralıkla tekrar dene.
+                        interval = polls[slug]["interval"]
+                        heapq.heappush(schedule, (time.monotonic() + interval, order, slug))
+                        print(f"[WARN] [{slug}] poll failed, retry in {interval:.0f}s")
+                        continue
+                    links = unique(a.extract_article_links(slug, url, html))
+                    new_links = [
+                        u for u in links if u not in self.seen_urls and u not in queued
+                    ]
+                    for u in new_links:
+                        seq += 1
+                        queued.add(u)
+                        heapq.heappush(pending, (-polls[slug]["rate"], seq, u, slug))
+
+                    now = time.monotonic()
+                    interval = next_poll_interval(polls[slug], len(new_links), now)
+                    heapq.heappush(schedule, (now + interval, order, slug))
+                    print(
+                        f"[INFO] [{slug}] polled: {len(new_links)} new, "
+                        f"next poll in {interval:.0f}s"
+                    )
+
+                if pending:
+                    _, _, article_url, slug = heapq.heappop(pending)
+                    queued.discard(article_url)
+                    if self.save_article(slug, article_url) == IN_WINDOW:
+                        self.writer.flush()
+                    continue
+
+                time.sleep(max(schedule[0][0] - time.monotonic(), 0))
+        except KeyboardInterrupt:
+            print("[INFO] daemon: stopping")
+        finally:
+            self.writer.close()
+            self.metrics.report(a.name)
@@ -0,0 +1,62 @@
+import time
+from typing import Optional
+
+import requests
+
+from crawler.metrics import Metrics
+
+
+class Fetcher:
+    """Tek bir HTTP oturumu; istekler arasında en az `delay` saniye bekler.
+
+    Bekleme, bir önceki isteğin bitişinden bu yana geçen süre düşülerek
+    yapılır; parse süresi zaten gecikmeyi karşılıyorsa hiç uyunmaz.
+    """
+
+    def __init__(self, user_agent: str, delay: float, metrics: Metrics, timeout: float = 15):
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": user_agent})
+        self.delay = delay
+        self.timeout = timeout
+        self.metrics = metrics
+        self._last = 0.0
+
+    def _wait(self) -> None:
+        wait = self._last + self.delay - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _get(self, url: str, stream: bool = False) -> Optional[requests.Response]:
+        self._wait()
+        started = time.monotonic()
+        try:
+            resp = self.session.get(url, timeout=self.timeout, stream=stream)
+        except Exception as e:
+            print(f"[ERROR] fetch failed {url}: {e}")
+            self.metrics.incr("fetch_errors")
+            return None
+        finally:
+            self._last = time.monotonic()
+            self.metrics.add_time("fetch", self._last - started)
+
+        self.metrics.incr("requests")
+        if resp.status_code != 200:
+            print(f"[WARN] {url} status={resp.status_code}")
+            self.metrics.incr("http_errors")
+            resp.close()
+            return None
+        return resp
+
+    def get_text(self, url: str) -> Optional[str]:
+        resp = self._get(url)
+        if resp is None:
+            return None
+        # Sunucu charset bildirmediyse tahmin et (tüm gövdeyi taradığı için pahalı).
+        if "charset" not in resp.headers.get("Content-Type", "").lower():
+            resp.encoding = resp.apparent_encoding or "utf-8"
+        self.metrics.incr("bytes", len(resp.content))
+        return resp.text
+
+    def stream(self, url: str) -> Optional[requests.Response]:
+        """Gövdesi `iter_content` ile parça parça okunacak yanıt (kapatmak çağırana ait)."""
+        return self._get(url, stream=True)
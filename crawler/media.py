@@ -0,0 +1,35 @@
+import re
+from urllib.parse import urljoin
+
+IMAGE_RE = re.compile(r"\.(jpg|jpeg|png|gif|webp)(\?|$)", re.IGNORECASE)
+VIDEO_RE = re.compile(r"\.(mp4|webm|m3u8)(\?|$)", re.IGNORECASE)
+LAYOUT_WORDS = ("logo", "icon", "sprite", "favicon", "placeholder")
+
+
+def normalize_url(src: str, base_url: str) -> str:
+    src = (src or "").strip()
+    if not src:
+        return ""
+    if src.startswith("//"):
+        src = "https:" + src
+    elif src.startswith("/"):
+        src = urljoin(base_url, src)
+
+    return src
+
+
+def looks_like_image(url: str) -> bool:
+    return IMAGE_RE.search(url) is not None
+
+
+def looks_like_video(url: str) -> bool:
+    return VIDEO_RE.search(url) is not None
+
+
+def is_layout_asset(url: str) -> bool:
+    lower = url.lower()
+    if any(word in lower for word in LAYOUT_WORDS):
+        return True
+    if lower.endswith(".svg") or lower.endswith(".ico"):
+        return True
+    return False
@@ -0,0 +1,179 @@
+import re
+import json
+import html as htmllib
+from typing import Dict, List, Optional, Tuple
+
+from crawler.media import normalize_url
+
+# ---------------------------------------------------------------------
+#  JSON-LD / OPENGRAPH
+# ---------------------------------------------------------------------
+#  Haber sayfaları <head> içinde genellikle bir NewsArticle JSON-LD bloğu
+#  ve og:/article: meta etiketleri taşır. Bunlar DOM kurmadan, düz regex
+#  ile okunur; adaptörün DOM sezgileri yalnızca eksik kalan alanlar için
+#  çalışır.
+
+# Bu tier'ın doldurabildiği kayıt alanları
+TIERED_FIELDS = ("title", "date_time", "body", "media_links")
+# Yalnızca tek bir görsel (çoğunlukla og:image paylaşım görseli) bulunduysa
+# medya "media_links" yerine bu anahtarla döner: makalenin tüm medyası değildir,
+# DOM'dan çıkarılanlar arkasına eklenmelidir.
+MEDIA_COVER = "media_cover"
+
+ARTICLE_TYPES = {
+    "newsarticle",
+    "article",
+    "reportagenewsarticle",
+    "analysisnewsarticle",
+    "backgroundnewsarticle",
+    "blogposting",
+    "videoobject",
+}
+
+HEAD_END_RE = re.compile(r"</head\s*>|<body[\s>]", re.IGNORECASE)
+LD_JSON_RE = re.compile(
+    r"<script[^>]+application/ld\+json[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+ATTR_RE = re.compile(r"""([a-zA-Z_:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+BREAK_TAG_RE = re.compile(r"<br\s*/?>|</?p\b[^>]*>", re.IGNORECASE)
+TAG_RE = re.compile(r"<[^>]+>")
+SPACES_RE = re.compile(r"[ \t\xa0]+")
+BLANK_LINES_RE = re.compile(r"\s*\n\s*\n\s*")
+
+
+def _clean_text(value: object) -> str:
+    if not isinstance(value, str):
+        return ""
+    text = htmllib.unescape(value)
+    if "<" in text:
+        # articleBody bazen HTML içerir: paragrafları koru, satır içi etiketleri at
+        text = TAG_RE.sub("", BREAK_TAG_RE.sub("\n\n", text))
+        text = BLANK_LINES_RE.sub("\n\n", SPACES_RE.sub(" ", text))
+    return text.strip()
+
+
+def _types(obj: Dict[str, object]) -> List[str]:
+    t = obj.get("@type")
+    if isinstance(t, str):
+        return [t.lower()]
+    if isinstance(t, list):
+        return [x.lower() for x in t if isinstance(x, str)]
+    return []
+
+
+def _iter_objects(data: object):
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_objects(item)
+    elif isinstance(data, dict):
+        yield data
+        graph = data.get("@graph")
+        if graph is not None:
+            yield from _iter_objects(graph)
+
+
+def _urls(value: object) -> List[str]:
+    """image / video / thumbnail değerleri: str, liste ya da {url|contentUrl|embedUrl}."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        out: List[str] = []
+        for v in value:
+            out.extend(_urls(v))
+        return out
+    if isinstance(value, dict):
+        out = []
+        for key in ("contentUrl", "embedUrl", "url"):
+            if isinstance(value.get(key), str):
+                out.append(value[key])
+                break
+        return out
+    return []
+
+
+def find_article_ld(html: str) -> Optional[Dict[str, object]]:
+    for m in LD_JSON_RE.finditer(html):
+        try:
+            data = json.loads(m.group(1).strip(), strict=False)
+        except ValueError:
+            continue
+        for obj in _iter_objects(data):
+            if ARTICLE_TYPES.intersection(_types(obj)):
+                return obj
+    return None
+
+
+def head_meta(html: str) -> Dict[str, List[str]]:
+    """<head> içindeki meta etiketleri: property/name/itemprop -> content listesi."""
+    m = HEAD_END_RE.search(html)
+    head = html[: m.start()] if m else html
+    meta: Dict[str, List[str]] = {}
+    for tag in META_TAG_RE.finditer(head):
+        attrs = {k.lower(): v1 or v2 for k, v1, v2 in ATTR_RE.findall(tag.group(0))}
+        key = (attrs.get("property") or attrs.get("name") or attrs.get("itemprop") or "").lower()
+        content = attrs.get("content", "").strip()
+        if key and content:
+            meta.setdefault(key, []).append(htmllib.unescape(content))
+    return meta
+
+
+def _add_media(
+    found: Dict[str, Tuple[str, object]],
+    tier: str,
+    rich: List[str],
+    images: List[str],
+    base_url: str,
+) -> None:
+    """Video / associatedMedia ya da birden çok öğe varsa "media_links", tek
+    görsel varsa MEDIA_COVER olarak kaydeder."""
+    rich = [u for u in (normalize_url(u, base_url) for u in rich) if u]
+    media = rich + [u for u in (normalize_url(u, base_url) for u in images) if u]
+    media = list(dict.fromkeys(media))
+    if not media:
+        return
+    complete = bool(rich) or len(media) > 1
+    found["media_links" if complete else MEDIA_COVER] = (tier, media)
+
+
+def extract_metadata(html: str, base_url: str) -> Dict[str, Tuple[str, object]]:
+    """Yapısal bloklardan alan -> (tier, değer); tier "jsonld" ya da "og".
+
+    Medya tek bir görselden ibaretse "media_links" yerine MEDIA_COVER döner.
+    """
+    found: Dict[str, Tuple[str, object]] = {}
+
+    ld = find_article_ld(html)
+    if ld is not None:
+        title = _clean_text(ld.get("headline") or ld.get("name"))
+        if title:
+            found["title"] = ("jsonld", title)
+        published = _clean_text(ld.get("datePublished") or ld.get("uploadDate"))
+        if published:
+            found["date_time"] = ("jsonld", published)
+        body = _clean_text(ld.get("articleBody"))
+        if body:
+            found["body"] = ("jsonld", body)
+        rich: List[str] = []
+        if "videoobject" in _types(ld):
+            rich.extend(_urls(ld))
+        for key in ("video", "associatedMedia"):
+            rich.extend(_urls(ld.get(key)))
+        _add_media(found, "jsonld", rich, _urls(ld.get("image")), base_url)
+
+    meta = head_meta(html)
+    if "title" not in found and meta.get("og:title"):
+        found["title"] = ("og", meta["og:title"][0].strip())
+    if "date_time" not in found:
+        for key in ("article:published_time", "og:published_time", "datepublished"):
+            if meta.get(key):
+                found["date_time"] = ("og", meta[key][0].strip())
+                break
+    if "media_links" not in found and MEDIA_COVER not in found:
+        videos: List[str] = []
+        for key in ("og:video:secure_url", "og:video:url", "og:video"):
+            videos.extend(meta.get(key, []))
+        _add_media(found, "og", videos, meta.get("og:image", []), base_url)
+
+    return found
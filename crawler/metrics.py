@@ -0,0 +1,37 @@
+import time
+from typing import Dict
+
+
+class Metrics:
+    """Tarama boyunca sayaç ve süre toplar; sonunda özet basar."""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+        self.started = time.monotonic()
+
+    def incr(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def report(self, source: str) -> None:
+        elapsed = time.monotonic() - self.started
+        print(f"[INFO] [{source}] stats after {elapsed:.1f}s:")
+        tiers: Dict[str, Dict[str, int]] = {}
+        for name in sorted(self.counters):
+            if name.startswith("tier."):
+                # tier.<alan>.<katman>: alan başına isabet oranı olarak basılır
+                _, field, tier = name.split(".", 2)
+                tiers.setdefault(field, {})[tier] = self.counters[name]
+                continue
+            print(f"[INFO]   {name}: {self.counters[name]}")
+        for field, counts in tiers.items():
+            total = sum(counts.values())
+            parts = ", ".join(
+                f"{tier} {n} ({n * 100 / total:.0f}%)" for tier, n in sorted(counts.items())
+            )
+            print(f"[INFO]   {field} source: {parts}")
+        for name in sorted(self.timings):
+            print(f"[INFO]   {name}_seconds: {self.timings[name]:.2f}")
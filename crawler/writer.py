@@ -0,0 +1,36 @@
+import os
+import json
+from typing import Dict, TextIO
+
+
+class JsonlWriter:
+    """Kategori başına `<prefix>_<slug>.jsonl` dosyasına ekleme yapar."""
+
+    def __init__(self, output_dir: str, prefix: str):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.files: Dict[str, TextIO] = {}
+
+    def path(self, slug: str) -> str:
+        return os.path.join(self.output_dir, f"{self.prefix}_{slug}.jsonl")
+
+    def write(self, slug: str, record: Dict[str, object]) -> None:
+        fh = self.files.get(slug)
+        if fh is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = self.path(slug)
+            print(f"[INFO]  -> writing category '{slug}' to {path}")
+            fh = self.files[slug] = open(path, "a", encoding="utf-8")
+        fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        for fh in self.files.values():
+            fh.flush()
+
+    def close(self) -> None:
+        for fh in self.files.values():
+            try:
+                fh.close()
+            except Exception:
+                pass
+        self.files.clear()
@@ -1,12 +1,19 @@
 import os
 import re
-import json
-import time
+import html as htmllib
+import sys
 from typing import Dict, List, Set, Optional
 from urllib.parse import urlparse
-import requests
 from bs4 import BeautifulSoup
 
+# `python dha/scraper.py` ile doğrudan çalıştırıldığında ortak `crawler`
+# paketi bir üst klasördedir (Docker'da scraper.py'nin yanına kopyalanır).
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler import Page, SourceAdapter, main
+from crawler.dedupe import unique
+from crawler.media import looks_like_image, looks_like_video, normalize_url as _normalize_url
+
 BASE_URL = "https://www.dha.com.tr"
 
 # ---------------------------------------------------------------------
@@ -31,33 +38,15 @@ CATEGORIES: Dict[str, str] = {
 # ---------------------------------------------------------------------
 #  AYARLAR
 # ---------------------------------------------------------------------
-OUTPUT_DIR = "output"
 MAX_PER_CATEGORY = 0
 MAX_PAGES_PER_CATEGORY = 50
 REQUEST_DELAY = 0.3
+USER_AGENT = "Mozilla/5.0 (compatible; dha-scraper/1.0; +https://example.com)"
 
+SITEMAP_URLS = [f"{BASE_URL}/sitemap.xml"]  # robots.txt'deki "Sitemap:" satırları da eklenir
+RSS_FEEDS: Dict[str, str] = {slug: f"{BASE_URL}/rss/{slug}" for slug in CATEGORIES}
 # ---------------------------------------------------------------------
-#  HTTP SESSION
-# ---------------------------------------------------------------------
-session = requests.Session()
-session.headers.update({
-    "User-Agent": "Mozilla/5.0 (compatible; dha-scraper/1.0; +https://example.com)"
-})
-# ---------------------------------------------------------------------
-
 
-def fetch(url: str) -> Optional[str]:
-    try:
-        resp = session.get(url, timeout=15)
-        if resp.status_code != 200:
-            print(f"[WARN] {url} status={resp.status_code}")
-            return None
-        resp.encoding = resp.apparent_encoding or "utf-8"
-        return resp.text
-    except Exception as e:
-        print(f"[ERROR] fetch failed {url}: {e}")
-        return None
-    
 
 def extract_article_links(html: str, category_slug: str) -> List[str]:
     links: List[str] = []
@@ -82,27 +71,11 @@ def extract_article_links(html: str, category_slug: str) -> List[str]:
         full = BASE_URL + href
         links.append(full)
 
-    seen: Set[str] = set()
-    deduped: List[str] = []
-    for u in links:
-        if u not in seen:
-            seen.add(u)
-            deduped.append(u)
-
-    return deduped
+    return unique(links)
 
 
 def normalize_url(src: str) -> str:
-    src = src.strip()
-    if not src:
-        return ""
-
-    if src.startswith("//"):
-        src = "https:" + src
-    elif src.startswith("/"):
-        src = BASE_URL + src
-
-    return src
+    return _normalize_url(src, BASE_URL)
 
 def canonical_media_key(url: str) -> str:
     parsed = urlparse(url)
@@ -118,14 +91,6 @@ def canonical_media_key(url: str) -> str:
     return f"{host}{path}"
 
 
-
-def looks_like_image(url: str) -> bool:
-    return bool(re.search(r"\.(jpg|jpeg|png|gif|webp)(\?|$)", url, re.IGNORECASE))
-
-
-def looks_like_video(url: str) -> bool:
-    return bool(re.search(r"\.(mp4|webm|m3u8)(\?|$)", url, re.IGNORECASE))
-
 VIDEO_URL_CANDIDATE = re.compile(r'https?://[^\s"\'<>]+', re.IGNORECASE)
 
 def extract_video_embed_urls_from_html(html: str) -> List[str]:
@@ -215,27 +180,24 @@ def extract_media_links(soup: BeautifulSoup) -> List[str]:
     return media
 
 
-def parse_article(url: str, html: str, category_slug: str) -> Dict[str, object]:
-    soup = BeautifulSoup(html, "html.parser")
+DATE_TIME_RE = re.compile(r"\d{2}\.\d{2}\.\d{4}\s*-\s*\d{2}:\d{2}")
+# get_text(" ") / strip_tags "<b>ANKARA</b>, (DHA)" için "ANKARA , (DHA)" üretir
+CITY_RE = re.compile(r"\b([A-ZÇĞİÖŞÜ]{3,})\s*,\s*\(DHA\)")
+SCRIPT_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r"<[^>]+>")
 
-    # Başlık
-    title_tag = soup.find("h1")
-    title = title_tag.get_text(strip=True) if title_tag else ""
 
-    # Kategori adı
-    category = CATEGORIES.get(category_slug, category_slug)
+def strip_tags(html: str) -> str:
+    """DOM kurmadan sayfanın kaba düz metni (script/style ve etiketler regex ile atılır)."""
+    return htmllib.unescape(TAG_RE.sub(" ", SCRIPT_RE.sub(" ", html)))
 
-    # Tarih-saat: "14.11.2025 - 16:02" gibi pattern
-    full_text = soup.get_text(" ", strip=True)
-    dt_match = re.search(r"\d{2}\.\d{2}\.\d{4}\s*-\s*\d{2}:\d{2}", full_text)
-    date_time = dt_match.group(0) if dt_match else ""
 
-    # Şehir: "ANKARA, (DHA)-" pattern’i
-    city = ""
-    city_match = re.search(r"\b([A-ZÇĞİÖŞÜ]{3,}),\s*\(DHA\)", full_text)
-    if city_match:
-        city = city_match.group(1).title()
+def is_video_link(url: str) -> bool:
+    low = url.lower()
+    return looks_like_video(url) or "embed" in low or "player" in low or "video" in low
 
+
+def extract_body(soup: BeautifulSoup) -> str:
     # Gövde: tüm <p>’ler (footer / telif uyarılarını kaba filtreyle ele)
     body_parts: List[str] = []
     for p in soup.find_all("p"):
@@ -247,100 +209,105 @@ def parse_article(url: str, html: str, category_slug: str) -> Dict[str, object]:
             continue
         body_parts.append(text)
 
-    body = "\n\n".join(body_parts)
-
-    # MEDYA LİNKLERİ
-    media_links = extract_media_links(soup)
-
-    if category_slug == "video":
-        filtered = []
-        for u in media_links:
-            if looks_like_video(u):
-                filtered.append(u)
-            else:
-                low = u.lower()
-                if "embed" in low or "player" in low or "video" in low:
-                    filtered.append(u)
-
-        if not filtered:
-            extra = extract_video_embed_urls_from_html(html)
-            filtered.extend(extra)
-
-        media_links = filtered
-
-    return {
-        "category": category,
-        "category_slug": category_slug,
-        "date_time": date_time,
-        "url": url,
-        "title": title,
-        "city": city,
-        "body": body,
-        "media_links": media_links,
-    }
-
-
-def crawl_category(category_slug: str, seen_urls: Set[str]) -> None:
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    out_path = os.path.join(OUTPUT_DIR, f"dha_{category_slug}.jsonl")
-
-    count = 0
-    for page in range(1, MAX_PAGES_PER_CATEGORY + 1):
-        if MAX_PER_CATEGORY and count >= MAX_PER_CATEGORY:
-            break
-
-        if page == 1:
-            url = f"{BASE_URL}/{category_slug}/"
-        else:
-            url = f"{BASE_URL}/{category_slug}/?page={page}"
-
-        print(f"[INFO] [{category_slug}] listing page {page}: {url}")
-        html = fetch(url)
-        if not html:
-            print(f"[INFO] [{category_slug}] no HTML, stop at page {page}")
-            break
-
-        links = extract_article_links(html, category_slug)
-        print(f"[INFO]   found {len(links)} raw links")
-
-        new_links = [u for u in links if u not in seen_urls]
-        print(f"[INFO]   new links this page: {len(new_links)}")
-        if not new_links:
-            print(f"[INFO] [{category_slug}] no new links, stop.")
-            break
-
-        with open(out_path, "a", encoding="utf-8") as fh:
-            for article_url in new_links:
-                if MAX_PER_CATEGORY and count >= MAX_PER_CATEGORY:
-                    break
-                time.sleep(REQUEST_DELAY)
-                a_html = fetch(article_url)
-                if not a_html:
-                    continue
-                data = parse_article(article_url, a_html, category_slug)
-                fh.write(json.dumps(data, ensure_ascii=False) + "\n")
-                seen_urls.add(article_url)
-                count += 1
-                print(f"[INFO]     saved {article_url}")
-
-        if len(new_links) < 3:
-            print(f"[INFO] [{category_slug}] very few new links, probably end. stop.")
-            break
-
-    print(f"[INFO] [{category_slug}] total saved: {count}")
-
-
-def main():
-    print(f"[INFO] Output dir: {OUTPUT_DIR}")
-    print(f"[INFO] Max per category: {MAX_PER_CATEGORY or 'no-limit'}")
-    print(f"[INFO] Max pages per category: {MAX_PAGES_PER_CATEGORY}")
-    print(f"[INFO] Categories: {', '.join(CATEGORIES.keys())}")
-
-    seen_urls: Set[str] = set()
-
-    for slug in CATEGORIES.keys():
-        crawl_category(slug, seen_urls)
+    return "\n\n".join(body_parts)
+
 
+# ---------------------------------------------------------------------
+#  ADAPTÖR
+# ---------------------------------------------------------------------
+
+
+def category_for_url(url: str) -> Optional[str]:
+    parsed = urlparse(url)
+    if not parsed.netloc.endswith("dha.com.tr"):
+        return None
+    first = (parsed.path or "").strip("/").split("/")[0]
+    if first in CATEGORIES and first != "son-dakika":
+        return first
+    return None
+
+
+class DhaAdapter(SourceAdapter):
+    name = "dha"
+    base_url = BASE_URL
+    categories = CATEGORIES
+    user_agent = USER_AGENT
+    request_delay = REQUEST_DELAY
+    max_listing_pages = MAX_PAGES_PER_CATEGORY
+    max_per_category = MAX_PER_CATEGORY
+    min_new_links_per_page = 3
+    sitemap_urls = SITEMAP_URLS
+    rss_feeds = RSS_FEEDS
+
+    def listing_url(self, slug: str) -> str:
+        return f"{BASE_URL}/{slug}/"
+
+    def extract_article_links(self, slug: str, listing_url: str, html: str) -> List[str]:
+        return extract_article_links(html, slug)
+
+    def next_listing_urls(self, slug: str, listing_url: str, html: str, page: int) -> List[str]:
+        return [f"{BASE_URL}/{slug}/?page={page + 1}"]
+
+    def category_for_url(self, url: str) -> Optional[str]:
+        return category_for_url(url)
+
+    # --- makale sayfası ---
+
+    def build_dom(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, "html.parser")
+
+    def full_text(self, page: Page) -> str:
+        if "text" not in page.cache:
+            page.cache["text"] = page.dom.get_text(" ", strip=True)
+        return page.cache["text"]
+
+    def extract_title(self, page: Page) -> str:
+        title_tag = page.dom.find("h1")
+        return title_tag.get_text(strip=True) if title_tag else ""
+
+    def extract_date_time(self, page: Page) -> str:
+        # "14.11.2025 - 16:02" gibi pattern
+        dt_match = DATE_TIME_RE.search(self.full_text(page))
+        return dt_match.group(0) if dt_match else ""
+
+    def extract_body(self, page: Page) -> str:
+        return extract_body(page.dom)
+
+    def extract_media_links(self, page: Page) -> List[str]:
+        media_links = extract_media_links(page.dom)
+        if page.slug == "video":
+            media_links = [u for u in media_links if is_video_link(u)]
+            if not media_links:
+                media_links = extract_video_embed_urls_from_html(page.html)
+        return media_links
+
+    def media_from_metadata(self, page: Page, media: List[str]) -> List[str]:
+        if page.slug == "foto-galeri":
+            # og:image / JSON-LD image yalnızca kapak görseli; galeri DOM'dan
+            return []
+        if page.slug == "video":
+            return [u for u in media if is_video_link(u)]
+        return media
+
+    def media_key(self, url: str) -> str:
+        return canonical_media_key(url)
+
+    def build_record(self, page: Page, fields: Dict[str, object]) -> Dict[str, object]:
+        body = str(fields["body"])
+        # Şehir: "ANKARA, (DHA)-" pattern’i (önce gövdede, sonra tüm sayfa metninde)
+        city_match = CITY_RE.search(body) or CITY_RE.search(
+            self.full_text(page) if "text" in page.cache else strip_tags(page.html)
+        )
+        return {
+            "category": CATEGORIES.get(page.slug, page.slug),
+            "category_slug": page.slug,
+            "date_time": fields["date_time"],
+            "url": page.url,
+            "title": fields["title"],
+            "city": city_match.group(1).title() if city_match else "",
+            "body": body,
+            "media_links": fields["media_links"],
+        }
 
 if __name__ == "__main__":
-    main()
+    main(DhaAdapter())
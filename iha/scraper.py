@@ -2,14 +2,20 @@ from __future__ import annotations
 
 import os
 import re
-import json
-import time
-from typing import Dict, TextIO, Tuple, List, Set
+import sys
+from typing import Dict, List, Set
 from urllib.parse import urljoin, urlparse
 
-import requests
 from bs4 import BeautifulSoup
 
+# `python iha/scraper.py` ile doğrudan çalıştırıldığında ortak `crawler`
+# paketi bir üst klasördedir (Docker'da scraper.py'nin yanına kopyalanır).
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler import Page, SourceAdapter, main
+from crawler.dedupe import unique
+from crawler.media import looks_like_image, looks_like_video, normalize_url
+
 # ---------------------------------------------------------------------
 #  KATEGORİ TANIMLARI
 # ---------------------------------------------------------------------
@@ -82,68 +88,38 @@ CATEGORIES: Dict[str, Dict[str, str]] = {
         "url": f"{BASE_URL}/foto"},
 }
 
+
 # ---------------------------------------------------------------------
 #  AYARLAR
 # ---------------------------------------------------------------------
 
-OUTPUT_DIR = "output"
-
 _raw_limit = "0"
 try:
     MAX_ARTICLES = int(_raw_limit)
 except ValueError:
     MAX_ARTICLES = 300
 
-ARTICLE_LIMIT: int | None = None if MAX_ARTICLES <= 0 else MAX_ARTICLES
-
 REQUEST_DELAY = float("0.7")
 MAX_LISTING_PAGES = int("2000")
-# ---------------------------------------------------------------------
-#  HTTP SESSION
-# ---------------------------------------------------------------------
-
-SESSION = requests.Session()
-SESSION.headers.update(
-    {
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0 Safari/537.36"
-        )
-    }
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0 Safari/537.36"
 )
 
+SITEMAP_URLS = [f"{BASE_URL}/sitemap.xml"]  # robots.txt'deki "Sitemap:" satırları da eklenir
+# Akış yolu slug'dan değil sitedeki kategori yolundan gelir (kultur_sanat -> kultur-sanat)
+RSS_FEEDS: Dict[str, str] = {
+    slug: f"{BASE_URL}/rss/{urlparse(cfg['url']).path.strip('/')}"
+    for slug, cfg in CATEGORIES.items()
+}
+
 # ---------------------------------------------------------------------
 #  YARDIMCI FONKSİYONLAR
 # ---------------------------------------------------------------------
 
 def normalize_media_url(src: str) -> str:
-    src = (src or "").strip()
-    if not src:
-        return ""
-    if src.startswith("//"):
-        src = "https:" + src
-    elif src.startswith("/"):
-        src = urljoin(BASE_URL, src)
-
-    return src
-
-
-def looks_like_image(url: str) -> bool:
-    return bool(re.search(r"\.(jpg|jpeg|png|gif|webp)(\?|$)", url, re.IGNORECASE))
-
-
-def looks_like_video(url: str) -> bool:
-    return bool(re.search(r"\.(mp4|webm|m3u8)(\?|$)", url, re.IGNORECASE))
-
-
-def is_layout_asset(url: str) -> bool:
-    lower = url.lower()
-    if any(word in lower for word in ["logo", "icon", "sprite", "favicon", "placeholder"]):
-        return True
-    if lower.endswith(".svg") or lower.endswith(".ico"):
-        return True
-    return False
+    return normalize_url(src, BASE_URL)
 
 
 def extract_media_links(soup: BeautifulSoup, only_videos: bool = False) -> List[str]:
@@ -224,14 +200,7 @@ def extract_media_links(soup: BeautifulSoup, only_videos: bool = False) -> List[
 
 
 
-def get_soup(url: str) -> BeautifulSoup | None:
-    try:
-        resp = SESSION.get(url, timeout=15)
-        resp.raise_for_status()
-    except Exception as e:
-        print(f"[WARN] Failed to fetch {url}: {e}")
-        return None
-    return BeautifulSoup(resp.text, "html.parser")
+PAGE_NUMBER_RE = re.compile(r"/sayfa[-/=]?(\d+)")
 
 
 def is_article_url(url: str) -> bool:
@@ -244,6 +213,9 @@ def is_article_url(url: str) -> bool:
         return False
 
     last = path.split("/")[-1]
+    if PAGE_NUMBER_RE.search(path):
+        # /gundem/sayfa-2 bir listeleme sayfası
+        return False
     parts = last.split("-")
     if parts[-1].isdigit():
         return True
@@ -255,14 +227,15 @@ def is_article_url(url: str) -> bool:
 
 
 
-def extract_article_links(listing_url: str, soup: BeautifulSoup) -> Set[str]:
-    links: Set[str] = set()
+def extract_article_links(listing_url: str, soup: BeautifulSoup) -> List[str]:
+    links: List[str] = []
     for a in soup.find_all("a", href=True):
         href = a["href"]
         full = urljoin(listing_url, href)
         if is_article_url(full):
-            links.add(full)
-    return links
+            links.append(full)
+    # Sayfa sırası korunur (yeniden eskiye); --since/--until buna dayanır.
+    return unique(links)
 
 
 def extract_pagination_links(start_url: str, listing_url: str, soup: BeautifulSoup) -> Set[str]:
@@ -277,6 +250,12 @@ def extract_pagination_links(start_url: str, listing_url: str, soup: BeautifulSo
     return pages
 
 
+def pagination_number(url: str) -> int:
+    """Listeleme URL'sinin sayfa numarası (ilk sayfa için 1)."""
+    m = PAGE_NUMBER_RE.search(urlparse(url).path)
+    return int(m.group(1)) if m else 1
+
+
 def extract_city_from_url(url: str) -> str:
     try:
         parsed = urlparse(url)
@@ -312,18 +291,15 @@ def parse_date_time(soup: BeautifulSoup) -> str:
     return ""
 
 
-def parse_article(url: str, soup: BeautifulSoup) -> Dict[str, str]:
-    # Başlık
-    title_tag = soup.find("h1")
-    title = title_tag.get_text(strip=True) if title_tag else ""
+def is_video_page(url: str) -> bool:
+    return (urlparse(url).path or "").strip("/").startswith("video")
+
 
-    # Tarih/saat
-    date_time = parse_date_time(soup)
+def is_photo_page(url: str) -> bool:
+    return (urlparse(url).path or "").strip("/").startswith("foto")
 
-    # Şehir (URL'den)
-    city = extract_city_from_url(url)
 
-    # Gövde
+def extract_body(soup: BeautifulSoup) -> str:
     body_texts: List[str] = []
     main = soup.find("main") or soup.find("article")
 
@@ -338,163 +314,115 @@ def parse_article(url: str, soup: BeautifulSoup) -> Dict[str, str]:
             if txt:
                 body_texts.append(txt)
 
-    body = "\n\n".join(body_texts)
-
-    try:
-        parsed = urlparse(url)
-        path = (parsed.path or "").strip("/")
-    except Exception:
-        path = ""
-    is_video_page = path.startswith("video")
-
-    # Medya linkleri
-    media_links = extract_media_links(soup, only_videos=is_video_page)
-
-    return {
-        "url": url,
-        "title": title,
-        "date_time": date_time,
-        "city": city,
-        "body": body,
-        "media_links": media_links,
-    }
+    return "\n\n".join(body_texts)
 
 
 # ---------------------------------------------------------------------
-#  DOSYA YAZMA
+#  ADAPTÖR
 # ---------------------------------------------------------------------
 
+CATEGORY_PATHS: Dict[str, str] = {
+    urlparse(cfg["url"]).path.strip("/"): slug for slug, cfg in CATEGORIES.items()
+}
 
-def get_file_handle(cat_slug: str, category_files: Dict[str, TextIO]) -> TextIO:
-    if cat_slug not in category_files:
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-        path = os.path.join(OUTPUT_DIR, f"iha_{cat_slug}.jsonl")
-        print(f"[INFO]  -> writing category '{cat_slug}' to {path}")
-        category_files[cat_slug] = open(path, "a", encoding="utf-8")
-    return category_files[cat_slug]
-
-
-# ---------------------------------------------------------------------
-#  KATEGORİ BAZLI CRAWL
-# ---------------------------------------------------------------------
-
-
-def crawl_category(
-    cat_slug: str,
-    cat_name: str,
-    start_url: str,
-    category_files: Dict[str, TextIO],
-    global_seen_urls: Set[str],
-    global_start_count: int,
-) -> int:
-    visited_listing: Set[str] = set()
-    listing_queue: List[str] = [start_url]
-
-    fetched_here = 0
-
-    print(f"[INFO] === CATEGORY {cat_slug} ({cat_name}) ===")
-    while (
-        listing_queue
-        and len(visited_listing) < MAX_LISTING_PAGES
-        and (ARTICLE_LIMIT is None or global_start_count + fetched_here < ARTICLE_LIMIT)
-    ):
-        listing_url = listing_queue.pop(0)
-        if listing_url in visited_listing:
-            continue
-        visited_listing.add(listing_url)
-
-        print(f"[INFO] Fetch listing: {listing_url}")
-        soup = get_soup(listing_url)
-        if soup is None:
-            continue
 
-        new_article_links = extract_article_links(listing_url, soup)
-        print(
-            f"[INFO]   found {len(new_article_links)} article links "
-            f"(before dedup: {len(new_article_links)})"
+def category_for_url(url: str) -> str | None:
+    if not is_article_url(url):
+        return None
+    first = (urlparse(url).path or "").strip("/").split("/")[0]
+    if first in CATEGORY_PATHS:
+        return CATEGORY_PATHS[first]
+    if first.endswith("-haberleri"):
+        return "yerel"
+    if first.startswith("video"):
+        return "video"
+    if first.startswith("foto"):
+        return "foto"
+    return None
+
+
+class IhaAdapter(SourceAdapter):
+    name = "iha"
+    base_url = BASE_URL
+    categories = {slug: cfg["name"] for slug, cfg in CATEGORIES.items()}
+    user_agent = USER_AGENT
+    request_delay = REQUEST_DELAY
+    max_listing_pages = MAX_LISTING_PAGES
+    max_articles = max(MAX_ARTICLES, 0)
+    sitemap_urls = SITEMAP_URLS
+    rss_feeds = RSS_FEEDS
+
+    def __init__(self):
+        self._listing_html: str | None = None
+        self._listing_soup: BeautifulSoup | None = None
+
+    def listing_soup(self, html: str) -> BeautifulSoup:
+        # Aynı listeleme sayfası hem makale hem sayfalama linkleri için
+        # kullanılıyor; iki kez parse etme.
+        if html is not self._listing_html:
+            self._listing_html = html
+            self._listing_soup = BeautifulSoup(html, "html.parser")
+        return self._listing_soup
+
+    def listing_url(self, slug: str) -> str:
+        return CATEGORIES[slug]["url"]
+
+    def extract_article_links(self, slug: str, listing_url: str, html: str) -> List[str]:
+        return extract_article_links(listing_url, self.listing_soup(html))
+
+    def next_listing_urls(self, slug: str, listing_url: str, html: str, page: int) -> List[str]:
+        # Motor sayfaları yeniden eskiye, birer birer gezer: sayfadaki tüm
+        # sayfalama linkleri değil, numarası bir sonraki olan sayfa döner.
+        soup = self.listing_soup(html)
+        current = pagination_number(listing_url)
+        pages = sorted(
+            (pagination_number(u), u)
+            for u in extract_pagination_links(self.listing_url(slug), listing_url, soup)
         )
-
-        new_pages = extract_pagination_links(start_url, listing_url, soup)
-        for p in new_pages:
-            if p not in visited_listing and p not in listing_queue:
-                listing_queue.append(p)
-
-        fh = get_file_handle(cat_slug, category_files)
-        for article_url in sorted(new_article_links):
-            if article_url in global_seen_urls:
-                continue
-
-            if ARTICLE_LIMIT is not None and global_start_count + fetched_here >= ARTICLE_LIMIT:
-                break
-
-            print(f"[INFO] Fetch article: {article_url}")
-            article_soup = get_soup(article_url)
-            if article_soup is None:
-                continue
-
-            data = parse_article(article_url, article_soup)
-            record = {
-                "category": cat_name,
-                "date_time": data["date_time"],
-                "url": data["url"],
-                "title": data["title"],
-                "city": data["city"],
-                "body": data["body"],
-                "media_links": data.get("media_links", []),
-            }
-            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
-            fetched_here += 1
-            global_seen_urls.add(article_url)
-            time.sleep(REQUEST_DELAY)
-
-        time.sleep(REQUEST_DELAY)
-
-    print(
-        f"[INFO] Category {cat_slug} done. "
-        f"Visited listing pages={len(visited_listing)}, fetched articles={fetched_here}"
-    )
-    return fetched_here
-
-
-# ---------------------------------------------------------------------
-#  ANA CRAWL
-# ---------------------------------------------------------------------
-
-
-def crawl():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-    category_files: Dict[str, TextIO] = {}
-    global_seen_urls: Set[str] = set()
-    total_fetched = 0
-
-    try:
-        for slug, cfg in CATEGORIES.items():
-            if ARTICLE_LIMIT is not None and total_fetched >= ARTICLE_LIMIT:
-                print("[INFO] Global article limit reached, stopping.")
-                break
-
-            cat_name = cfg["name"]
-            start_url = cfg["url"]
-
-            fetched = crawl_category(
-                slug,
-                cat_name,
-                start_url,
-                category_files,
-                global_seen_urls,
-                total_fetched,
-            )
-            total_fetched += fetched
-
-        print(f"[INFO] ALL DONE. Total articles fetched: {total_fetched}")
-    finally:
-        for fh in category_files.values():
-            try:
-                fh.close()
-            except Exception:
-                pass
-
+        for number, url in pages:
+            if number > current:
+                return [url]
+        return []
+
+    def category_for_url(self, url: str) -> str | None:
+        return category_for_url(url)
+
+    # --- makale sayfası ---
+
+    def build_dom(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, "html.parser")
+
+    def extract_title(self, page: Page) -> str:
+        title_tag = page.dom.find("h1")
+        return title_tag.get_text(strip=True) if title_tag else ""
+
+    def extract_date_time(self, page: Page) -> str:
+        return parse_date_time(page.dom)
+
+    def extract_body(self, page: Page) -> str:
+        return extract_body(page.dom)
+
+    def extract_media_links(self, page: Page) -> List[str]:
+        return extract_media_links(page.dom, only_videos=is_video_page(page.url))
+
+    def media_from_metadata(self, page: Page, media: List[str]) -> List[str]:
+        if is_photo_page(page.url):
+            # og:image / JSON-LD image yalnızca kapak görseli; galeri DOM'dan
+            return []
+        if is_video_page(page.url):
+            return [u for u in media if looks_like_video(u)]
+        return media
+
+    def build_record(self, page: Page, fields: Dict[str, object]) -> Dict[str, object]:
+        return {
+            "category": CATEGORIES[page.slug]["name"],
+            "date_time": fields["date_time"],
+            "url": page.url,
+            "title": fields["title"],
+            "city": extract_city_from_url(page.url),
+            "body": fields["body"],
+            "media_links": fields["media_links"],
+        }
 
 if __name__ == "__main__":
-    crawl()
+    main(IhaAdapter())
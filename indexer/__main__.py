@@ -0,0 +1,4 @@
+from indexer.indexer import main
+
+if __name__ == "__main__":
+    main()
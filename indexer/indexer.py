@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import sqlite3
+import argparse
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from crawler.dates import TR_TZ, parse_datetime
+
+# ---------------------------------------------------------------------
+#  AYARLAR
+# ---------------------------------------------------------------------
+
+DEFAULT_DATA_DIRS = ["output"]
+DEFAULT_INDEX_PATH = os.path.join("output", "index.db")
+DEFAULT_LIMIT = 20
+WATCH_INTERVAL = 30.0
+COMMIT_EVERY = 2000
+
+# ---------------------------------------------------------------------
+#  TÜRKÇE TOKENİZASYON
+# ---------------------------------------------------------------------
+
+# str.lower() "İ" harfini "i̇" (i + birleşik nokta) yapar, "I" harfini de
+# "i" yapar; Türkçede doğrusu İ -> i ve I -> ı.
+_TR_UPPER = str.maketrans({"İ": "i", "I": "ı"})
+
+# Filtre anahtarları (şehir/kategori) için aksanları da düşür ki
+# "Gündem", "GÜNDEM" ve "gundem" aynı anahtara düşsün.
+_ASCII_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def turkish_lower(text: str) -> str:
+    return (text or "").translate(_TR_UPPER).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(turkish_lower(text)) if len(t) > 1 or t.isdigit()]
+
+
+def fold_key(value: str) -> str:
+    folded = turkish_lower(value).translate(_ASCII_FOLD)
+    return re.sub(r"[\s_]+", "-", folded.strip())
+
+
+# ---------------------------------------------------------------------
+#  TARİH
+# ---------------------------------------------------------------------
+
+def parse_date(value: str) -> str:
+    """`date_time` alanından (Türkiye saatiyle) YYYY-MM-DD üretir, çözemezse "" döner."""
+    dt = parse_datetime(value)
+    if dt is None:
+        return ""
+    return dt.astimezone(TR_TZ).date().isoformat()
+
+
+# ---------------------------------------------------------------------
+#  İNDEKS ŞEMASI
+# ---------------------------------------------------------------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    city TEXT NOT NULL,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_category ON docs(category, date);
+CREATE INDEX IF NOT EXISTS docs_city ON docs(city, date);
+CREATE INDEX IF NOT EXISTS docs_date ON docs(date);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (term_id, doc_id)
+) WITHOUT ROWID;
+"""
+
+
+def open_index(path: str) -> sqlite3.Connection:
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# ---------------------------------------------------------------------
+#  İNDEKSLEME
+# ---------------------------------------------------------------------
+
+
+def find_jsonl_files(data_dirs: List[str]) -> List[str]:
+    paths: List[str] = []
+    for d in data_dirs:
+        paths.extend(glob.glob(os.path.join(d, "*.jsonl")))
+    return sorted(os.path.abspath(p) for p in paths)
+
+
+def iter_new_lines(path: str, offset: int) -> Iterator[Tuple[int, bytes]]:
+    """`offset`ten itibaren tamamlanmış satırları (başlangıç ofsetiyle) verir.
+
+    Yazıcı henüz satırı bitirmediyse (sonda "\\n" yoksa) o satır atlanır;
+    bir sonraki güncellemede baştan okunur.
+    """
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        pos = offset
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            yield pos, line
+            pos += len(line)
+
+
+class TermCache:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.ids: Dict[str, int] = {}
+
+    def get(self, term: str) -> int:
+        tid = self.ids.get(term)
+        if tid is not None:
+            return tid
+        row = self.conn.execute("SELECT id FROM terms WHERE term = ?", (term,)).fetchone()
+        if row:
+            tid = row[0]
+        else:
+            tid = self.conn.execute("INSERT INTO terms(term) VALUES (?)", (term,)).lastrowid
+        self.ids[term] = tid
+        return tid
+
+
+def drop_file(conn: sqlite3.Connection, file_id: int) -> None:
+    conn.execute(
+        "DELETE FROM postings WHERE doc_id IN (SELECT id FROM docs WHERE file_id = ?)",
+        (file_id,),
+    )
+    conn.execute("DELETE FROM docs WHERE file_id = ?", (file_id,))
+    conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+
+def index_file(conn: sqlite3.Connection, terms: TermCache, path: str) -> int:
+    st = os.stat(path)
+    row = conn.execute(
+        "SELECT id, inode, offset FROM files WHERE path = ?", (path,)
+    ).fetchone()
+
+    if row and (row[1] != st.st_ino or row[2] > st.st_size):
+        # Dosya yeniden yazılmış / kısalmış (ör. sıkıştırma sonrası): baştan al.
+        print(f"[INFO] {path} changed on disk, re-indexing from scratch")
+        drop_file(conn, row[0])
+        row = None
+
+    if row is None:
+        file_id = conn.execute(
+            "INSERT INTO files(path, inode, offset) VALUES (?, ?, 0)",
+            (path, st.st_ino),
+        ).lastrowid
+        offset = 0
+    else:
+        file_id, offset = row[0], row[2]
+
+    if offset == st.st_size:
+        return 0
+
+    added = 0
+    end = offset
+    for pos, line in iter_new_lines(path, offset):
+        end = pos + len(line)
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            print(f"[WARN] {path}@{pos}: invalid JSON line, skipped")
+            continue
+
+        doc_id = conn.execute(
+            "INSERT INTO docs(file_id, offset, category, city, date) VALUES (?, ?, ?, ?, ?)",
+            (
+                file_id,
+                pos,
+                fold_key(rec.get("category_slug") or rec.get("category") or ""),
+                fold_key(rec.get("city") or ""),
+                parse_date(rec.get("date_time") or ""),
+            ),
+        ).lastrowid
+
+        doc_terms = set(tokenize(rec.get("title") or ""))
+        doc_terms.update(tokenize(rec.get("body") or ""))
+        conn.executemany(
+            "INSERT OR IGNORE INTO postings(term_id, doc_id) VALUES (?, ?)",
+            [(terms.get(t), doc_id) for t in doc_terms],
+        )
+
+        added += 1
+        if added % COMMIT_EVERY == 0:
+            conn.execute("UPDATE files SET offset = ? WHERE id = ?", (end, file_id))
+            conn.commit()
+
+    conn.execute("UPDATE files SET offset = ? WHERE id = ?", (end, file_id))
+    conn.commit()
+    return added
+
+
+def update_index(conn: sqlite3.Connection, data_dirs: List[str]) -> int:
+    terms = TermCache(conn)
+    total = 0
+    for path in find_jsonl_files(data_dirs):
+        added = index_file(conn, terms, path)
+        if added:
+            print(f"[INFO] indexed {added} new records from {path}")
+        total += added
+    return total
+
+
+# ---------------------------------------------------------------------
+#  SORGULAMA
+# ---------------------------------------------------------------------
+
+
+def resolve_term_ids(conn: sqlite3.Connection, word: str) -> List[int]:
+    """Tek kelimeyi term id listesine çevirir; sonda "*" varsa önek araması."""
+    if word.endswith("*"):
+        prefix = turkish_lower(word[:-1])
+        if not prefix:
+            return []
+        rows = conn.execute(
+            "SELECT id FROM terms WHERE term >= ? AND term < ?",
+            (prefix, prefix + "\U0010ffff"),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    row = conn.execute("SELECT id FROM terms WHERE term = ?", (word,)).fetchone()
+    return [row[0]] if row else []
+
+
+def search(
+    conn: sqlite3.Connection,
+    keywords: List[str],
+    category: Optional[str] = None,
+    city: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+) -> List[Tuple[str, int]]:
+    """Tüm kelimeleri içeren ve filtrelere uyan kayıtların (dosya, ofset) listesi."""
+    words: List[str] = []
+    for kw in keywords:
+        if kw.endswith("*"):
+            words.append(kw)
+        else:
+            words.extend(tokenize(kw))
+    if keywords and not words:
+        # Kelimelerin hepsi tokenize'da elendi (ör. tek harfli): hiçbir kayıt eşleşmez,
+        # filtre atlanıp tüm kayıtlar dönmemeli.
+        return []
+
+    sql = ["SELECT f.path, d.offset FROM docs d JOIN files f ON f.id = d.file_id"]
+    where: List[str] = []
+    params: List[object] = []
+
+    if words:
+        subqueries: List[str] = []
+        for w in words:
+            ids = resolve_term_ids(conn, w)
+            if not ids:
+                return []
+            marks = ",".join("?" * len(ids))
+            subqueries.append(f"SELECT doc_id FROM postings WHERE term_id IN ({marks})")
+            params.extend(ids)
+        sql.insert(0, "WITH hits(doc_id) AS (" + " INTERSECT ".join(subqueries) + ")")
+        sql.append("JOIN hits h ON h.doc_id = d.id")
+
+    if category:
+        where.append("d.category = ?")
+        params.append(fold_key(category))
+    if city:
+        where.append("d.city = ?")
+        params.append(fold_key(city))
+    if date_from:
+        where.append("d.date >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("d.date <= ?")
+        params.append(date_to)
+
+    if where:
+        sql.append("WHERE " + " AND ".join(where))
+    sql.append("ORDER BY d.date DESC, d.id DESC LIMIT ?")
+    params.append(limit)
+
+    return conn.execute(" ".join(sql), params).fetchall()
+
+
+def read_record(path: str, offset: int) -> Optional[Dict[str, object]]:
+    try:
+        with open(path, "rb") as fh:
+            fh.seek(offset)
+            return json.loads(fh.readline())
+    except (OSError, ValueError) as e:
+        print(f"[WARN] cannot read {path}@{offset}: {e}", file=sys.stderr)
+        return None
+
+
+# ---------------------------------------------------------------------
+#  CLI
+# ---------------------------------------------------------------------
+
+
+def cmd_build(args: argparse.Namespace) -> None:
+    conn = open_index(args.index)
+    try:
+        while True:
+            started = time.perf_counter()
+            added = update_index(conn, args.data)
+            elapsed = time.perf_counter() - started
+            print(f"[INFO] index update done: {added} new records in {elapsed:.1f}s")
+            if not args.watch:
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+
+def cmd_query(args: argparse.Namespace) -> None:
+    conn = open_index(args.index)
+    try:
+        started = time.perf_counter()
+        hits = search(
+            conn,
+            args.keywords,
+            category=args.category,
+            city=args.city,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            limit=args.limit,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        conn.close()
+
+    for path, offset in hits:
+        rec = read_record(path, offset)
+        if rec is None:
+            continue
+        if args.json:
+            print(json.dumps(rec, ensure_ascii=False))
+        else:
+            print(
+                f"{rec.get('date_time', '')} | {rec.get('category', '')} | "
+                f"{rec.get('city', '')} | {rec.get('title', '')}\n    {rec.get('url', '')}"
+            )
+    print(f"[INFO] {len(hits)} results in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m indexer",
+        description="Scraper çıktıları (*.jsonl) için ters indeks ve sorgu aracı.",
+    )
+    parser.add_argument(
+        "--index", default=DEFAULT_INDEX_PATH, help=f"indeks dosyası (varsayılan: {DEFAULT_INDEX_PATH})"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="yeni kayıtları indekse ekle (artımlı)")
+    p_build.add_argument(
+        "--data", nargs="+", default=DEFAULT_DATA_DIRS, help="*.jsonl dosyalarının bulunduğu klasörler"
+    )
+    p_build.add_argument(
+        "--watch",
+        type=float,
+        nargs="?",
+        const=WATCH_INTERVAL,
+        default=0,
+        metavar="SECONDS",
+        help=f"sürekli çalış, her SECONDS saniyede bir güncelle (varsayılan: {WATCH_INTERVAL:g})",
+    )
+    p_build.set_defaults(func=cmd_build)
+
+    p_query = sub.add_parser("query", help="anahtar kelime + filtre sorgusu")
+    p_query.add_argument("keywords", nargs="*", help='kelimeler (hepsi aranır), önek için "kelime*"')
+    p_query.add_argument("--category", help='kategori adı veya slug (ör. "gundem", "Kültür Sanat")')
+    p_query.add_argument("--city", help='şehir (ör. "istanbul")')
+    p_query.add_argument("--from", dest="date_from", metavar="YYYY-MM-DD")
+    p_query.add_argument("--to", dest="date_to", metavar="YYYY-MM-DD")
+    p_query.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    p_query.add_argument("--json", action="store_true", help="kayıtları JSONL olarak yaz")
+    p_query.set_defaults(func=cmd_query)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
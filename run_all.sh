@@ -5,14 +5,14 @@ cd "$(dirname "$0")"
 
 echo "=== IHA SCRAPER ==="
 mkdir -p iha_output
-docker build -t iha-scraper iha/
+docker build -f iha/Dockerfile -t iha-scraper .
 docker run --rm \
   -v "$(pwd)/iha_output:/app/output" \
   iha-scraper
 
 echo "=== DHA SCRAPER ==="
 mkdir -p dha_output
-docker build -t dha-scraper dha/
+docker build -f dha/Dockerfile -t dha-scraper .
 docker run --rm \
   -v "$(pwd)/dha_output:/app/output" \
   dha-scraper